@@ -6,31 +6,424 @@
 # validity of the move. If the move is valid, the move takes place, updating the board, capturing any piece, updating
 # game state if necessary, player turn changes (if game has not ended), and True is returned. Otherwise, returns False.
 
+import random
+import re
+from types import FunctionType, MappingProxyType
+
+ROWS = 8  # the standard board; Rules builds the tables below again for other sizes and starting layouts
+COLUMNS = 8
+BOARD_SQUARES = ROWS * COLUMNS
+COLUMN_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))  # (row change, column change): down, up, right, left
+BISHOP_DIRECTIONS = ((1, 1), (-1, -1), (-1, 1), (1, -1))  # down-right, up-left, up-right, down-left
+KNIGHT_OFFSETS = ((1, 2), (-1, 2), (2, 1), (2, -1), (-2, 1), (-2, -1), (1, -2), (-1, -2))
+KING_OFFSETS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+GAME_STATES = ('UNFINISHED', 'WHITE_WON', 'BLACK_WON', 'TIE')
+FEN_LETTERS = {'wk': 'K', 'wr': 'R', 'wb': 'B', 'wh': 'H', 'bk': 'k', 'br': 'r', 'bb': 'b', 'bh': 'h'}
+FEN_PIECES = {letter: piece for piece, letter in FEN_LETTERS.items()}
+PIECE_CODES = ('  ', 'wk', 'wr', 'wb', 'wh', 'bk', 'br', 'bb', 'bh')  # piece string of each piece code, 0 for none
+EMPTY, WK, WR, WB, WH, BK, BR, BB, BH = range(len(PIECE_CODES))
+PIECE_INDEX = MappingProxyType({piece: code for code, piece in enumerate(PIECE_CODES)})  # piece string -> piece code
+PIECE_COLOR = tuple(piece[0] for piece in PIECE_CODES)  # 'w', 'b', or ' ' for no piece
+PIECE_KIND = tuple(piece[1] for piece in PIECE_CODES)  # 'k', 'r', 'b', 'h', or ' ' for no piece
+ATTACKERS = {'w': (WR, WB, WH), 'b': (BR, BB, BH)}  # (rook, bishop, knight) piece codes of each color
+STANDARD_LAYOUT = '8/8/8/8/8/8/RBH2hbr/KBH2hbk'  # starting position, as the board field of a to_fen string
+
+
+def _square_names(rows, columns):
+    """Returns list of rows of square names, top row first: [row][column] is e.g. 'a8' for row 0, column 0 of an 8x8
+    board. Columns are lettered from 'a' and rows numbered from 1 at the bottom."""
+    return [[COLUMN_LETTERS[column] + str(rows - row) for column in range(columns)] for row in range(rows)]
+
+
+def _parse_board(text, rows, columns):
+    """Returns bytearray of the piece codes of the board field of a to_fen string (rows separated by '/', top row first,
+    pieces as letters and runs of empty squares as numbers) on a board of rows by columns squares. Raises ValueError if
+    text does not describe such a board."""
+    texts = text.split('/')
+    if len(texts) != rows:
+        raise ValueError('position string must have %d rows: %r' % (rows, text))
+    board = bytearray()
+    for row_text in texts:
+        row = bytearray()
+        empty = ''
+        for letter in row_text + '/':  # '/' ends the last run of empty squares
+            if letter.isdigit():
+                empty += letter
+                continue
+            if empty:
+                row.extend(bytes(int(empty)))
+                empty = ''
+            if letter in FEN_PIECES:
+                row.append(PIECE_INDEX[FEN_PIECES[letter]])
+            elif letter != '/':
+                raise ValueError('invalid piece letter %r in position string' % letter)
+        if len(row) != columns:
+            raise ValueError('invalid row %r in position string' % row_text)
+        board.extend(row)
+    return board
+
+
+SQUARE_NAMES = _square_names(ROWS, COLUMNS)  # SQUARE_NAMES[row][column], e.g. 'a8'
+SQUARES = tuple(name for row in SQUARE_NAMES for name in row)  # SQUARES[n] is name of 0-63 square n, e.g. 'a8' is 0
+SQUARE_INDEX = MappingProxyType({name: square for square, name in enumerate(SQUARES)})  # 'a8' -> 0, ..., 'h1' -> 63
+STARTING_BOARD = bytes(48) + bytes((WR, WB, WH, EMPTY, EMPTY, BH, BB, BR,  # piece code on each square, rows 8-3 empty
+                                    WK, WB, WH, EMPTY, EMPTY, BH, BB, BK))
+OCCUPANCY_BYTES = 8  # to_bytes record: bitmask of occupied squares, 4-bit code of each piece, one byte of flags
+PACKED_PIECES = 30
+RECORD_BYTES = OCCUPANCY_BYTES + PACKED_PIECES // 2 + 1
+
+
+# Squares are also numbered 0-63 as row * 8 + column, so 'a8' is square 0 and 'h1' is square 63. The tables below are
+# bitmasks over those numbers (bit n set for square n), built once when the module is imported.
+def _offset_table(offsets, rows, columns):
+    """Returns tuple of one bitmask per square, each marking the squares reachable from that square by a single
+    offset"""
+    table = []
+    for square in range(rows * columns):
+        row, column = divmod(square, columns)
+        mask = 0
+        for row_chn, column_chn in offsets:
+            if 0 <= row + row_chn < rows and 0 <= column + column_chn < columns:
+                mask |= 1 << ((row + row_chn) * columns + column + column_chn)
+        table.append(mask)
+    return tuple(table)
+
+
+def _line_tables(rows, columns):
+    """Returns two square-by-square tables: the index in KING_OFFSETS of the direction from one square to another (-1
+    if they share no row, column or diagonal), and bitmask of the squares strictly between them (0 if they share
+    none)."""
+    squares = rows * columns
+    direction = [[-1] * squares for _ in range(squares)]
+    between = [[0] * squares for _ in range(squares)]
+    for square in range(squares):
+        row, column = divmod(square, columns)
+        for index, (row_chn, column_chn) in enumerate(KING_OFFSETS):
+            mask = 0
+            new_row = row + row_chn
+            new_column = column + column_chn
+            while 0 <= new_row < rows and 0 <= new_column < columns:
+                direction[square][new_row * columns + new_column] = index
+                between[square][new_row * columns + new_column] = mask
+                mask |= 1 << (new_row * columns + new_column)
+                new_row += row_chn
+                new_column += column_chn
+    return tuple(tuple(row) for row in direction), tuple(tuple(row) for row in between)
+
+
+KING_ATTACKS = _offset_table(KING_OFFSETS, ROWS, COLUMNS)
+KNIGHT_ATTACKS = _offset_table(KNIGHT_OFFSETS, ROWS, COLUMNS)
+DIRECTION, BETWEEN = _line_tables(ROWS, COLUMNS)  # KING_OFFSETS[0:4] are rook directions, KING_OFFSETS[4:8] bishop's
+
+
+def _ray_table(row_chn, column_chn, rows, columns):
+    """Returns tuple of one bitmask per square, each marking every square from that square (exclusive) to the edge of
+    the board in the given direction"""
+    table = []
+    for square in range(rows * columns):
+        row, column = divmod(square, columns)
+        mask = 0
+        row += row_chn
+        column += column_chn
+        while 0 <= row < rows and 0 <= column < columns:
+            mask |= 1 << (row * columns + column)
+            row += row_chn
+            column += column_chn
+        table.append(mask)
+    return tuple(table)
+
+
+def _ray_tables(rows, columns):
+    """Returns (ROOK_RAYS_UP, ROOK_RAYS_DOWN, BISHOP_RAYS_UP, BISHOP_RAYS_DOWN, ROOK_LINES, BISHOP_LINES) for a board
+    of rows by columns squares"""
+    rook_up = (_ray_table(1, 0, rows, columns), _ray_table(0, 1, rows, columns))  # down, right
+    rook_down = (_ray_table(-1, 0, rows, columns), _ray_table(0, -1, rows, columns))  # up, left
+    bishop_up = (_ray_table(1, 1, rows, columns), _ray_table(1, -1, rows, columns))  # down-right, down-left
+    bishop_down = (_ray_table(-1, -1, rows, columns), _ray_table(-1, 1, rows, columns))  # up-left, up-right
+    squares = range(rows * columns)
+    rook_lines = tuple(rook_up[0][sq] | rook_up[1][sq] | rook_down[0][sq] | rook_down[1][sq] for sq in squares)
+    bishop_lines = tuple(bishop_up[0][sq] | bishop_up[1][sq] | bishop_down[0][sq] | bishop_down[1][sq]
+                         for sq in squares)
+    return rook_up, rook_down, bishop_up, bishop_down, rook_lines, bishop_lines
+
+
+# sliding rays, split by whether the direction increases the square number (first blocker is the lowest set bit) or
+# decreases it (first blocker is the highest set bit)
+ROOK_RAYS_UP, ROOK_RAYS_DOWN, BISHOP_RAYS_UP, BISHOP_RAYS_DOWN, ROOK_LINES, BISHOP_LINES = _ray_tables(ROWS, COLUMNS)
+
+
+def _slider_attacks(square, occupied, rays_up, rays_down):
+    """Returns bitmask of squares attacked from square along the given rays, stopping at (and including) the first
+    occupied square of each ray"""
+    attacks = 0
+    for rays in rays_up:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]  # cut ray beyond first blocker
+        attacks |= ray
+    for rays in rays_down:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(square, occupied):
+    """Returns bitmask of squares a rook on square attacks given bitmask of occupied squares"""
+    return _slider_attacks(square, occupied, ROOK_RAYS_UP, ROOK_RAYS_DOWN)
+
+
+def bishop_attacks(square, occupied):
+    """Returns bitmask of squares a bishop on square attacks given bitmask of occupied squares"""
+    return _slider_attacks(square, occupied, BISHOP_RAYS_UP, BISHOP_RAYS_DOWN)
+
+
+def _zobrist_keys(rows, columns):
+    """Returns tuple of one random 64-bit key per piece code per square of a board of rows by columns squares, used to
+    hash positions. A fixed seed keeps keys the same in every process, so hashes can be shared between processes; the
+    seed depends on the board's size, so boards with as many squares but another shape (4x16, 16x4) don't share keys.
+    EMPTY (no piece) hashes to 0."""
+    squares = rows * columns
+    rng = random.Random(20230914 if (rows, columns) == (ROWS, COLUMNS) else '20230914 %dx%d' % (rows, columns))
+    keys = ((0,) * squares,) + tuple(tuple(rng.getrandbits(64) for _ in range(squares)) for _ in PIECE_CODES[1:])
+    state_keys = {'UNFINISHED': 0, 'WHITE_WON': rng.getrandbits(64), 'BLACK_WON': rng.getrandbits(64),
+                  'TIE': rng.getrandbits(64)}
+    return keys, rng.getrandbits(64), rng.getrandbits(64), rng.getrandbits(64), state_keys
+
+
+ZOBRIST, ZOBRIST_BLACK_TURN, ZOBRIST_WK_AT_END, ZOBRIST_BK_AT_END, ZOBRIST_GAME_STATE = _zobrist_keys(ROWS, COLUMNS)
+
+
+class Move:
+    """Represents a move from one 0-63 square to another. Every possible move is created once, in MOVES, and shared by
+    all games, so a move carries its square numbers and names without any parsing when it is made."""
+
+    __slots__ = ('from_sq', 'to_sq', 'from_square', 'to_square')
+
+    def __init__(self, from_sq, to_sq, squares=SQUARES):
+        """Creates move from from_sq to to_sq, named from squares (the square names of the board, SQUARES for the
+        standard one). Use MOVES[from_sq][to_sq] or Move.parse rather than creating more."""
+        self.from_sq = from_sq
+        self.to_sq = to_sq
+        self.from_square = squares[from_sq]
+        self.to_square = squares[to_sq]
+
+    @staticmethod
+    def parse(text):
+        """Returns the shared Move for text such as 'a2a3'. Raises KeyError if text does not name two squares."""
+        return MOVES[SQUARE_INDEX[text[:2]]][SQUARE_INDEX[text[2:]]]
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and self.from_sq == other.from_sq and self.to_sq == other.to_sq
+
+    def __hash__(self):
+        return self.from_sq * 64 + self.to_sq
+
+    def __str__(self):
+        return self.from_square + self.to_square
+
+    def __repr__(self):
+        return 'Move(%r)' % str(self)
+
+
+MOVES = tuple(tuple(Move(from_sq, to_sq) for to_sq in range(64)) for from_sq in range(64))  # MOVES[from_sq][to_sq]
+
 
 class ChessVar:
-    """Represents a modified version of a chess game"""
+    """Represents a modified version of a chess game. The game works on 0-63 square numbers (row * 8 + column, so 'a8'
+    is 0 and 'h1' is 63): make_move_sq, play and legal_moves take and return square numbers and Move objects, and the
+    methods taking algebraic squares such as 'a1' (make_move, generate_legal_moves, etc.) parse them and call these.
+
+    To keep many live games cheap, a game has no __dict__ and stores small fixed-size arrays: the board as one piece
+    code (an index into PIECE_CODES) per square and captured pieces as a count per piece code, plus a bitmask of the
+    occupied squares. Everything else it looks up in the module's shared tables.
+
+    ChessVar plays on the standard 8x8 board; Rules(rows, columns, layout).game_class() returns a ChessVar for any other
+    board size and starting layout."""
+
+    __slots__ = ('_board', '_game_state', '_player_turn', '_captured', '_wk_sq', '_bk_sq', '_wk_at_end', '_bk_at_end',
+                 '_undo_stack', '_hash', '_occupied')
 
     def __init__(self):
-        """Creates a new ChessVar, with the board and its pieces initialized as below, where 'r' in a piece string
-        is for rook, 'k' is for king, 'b' is for bishop, 'h' is for knight, and 'w'/'b' are for white and black,
-        respectively. Starts with white's turn, and no pieces captured."""
-        self._board = [['  ', '  ', '  ', '  ', '  ', '  ', '  ', '  '],
-                       ['  ', '  ', '  ', '  ', '  ', '  ', '  ', '  '],
-                       ['  ', '  ', '  ', '  ', '  ', '  ', '  ', '  '],
-                       ['  ', '  ', '  ', '  ', '  ', '  ', '  ', '  '],
-                       ['  ', '  ', '  ', '  ', '  ', '  ', '  ', '  '],
-                       ['  ', '  ', '  ', '  ', '  ', '  ', '  ', '  '],
-                       ['wr', 'wb', 'wh', '  ', '  ', 'bh', 'bb', 'br'],
-                       ['wk', 'wb', 'wh', '  ', '  ', 'bh', 'bb', 'bk']]
+        """Creates a new ChessVar, with the board and its pieces initialized as in STARTING_BOARD: white rook, bishop,
+        knight on row 2 and king, bishop, knight on row 1 from the left, black the mirror image from the right. Starts
+        with white's turn, and no pieces captured."""
+        self._board = bytearray(STARTING_BOARD)  # _board[n] is code of piece on square n, row 8 first
         self._game_state = 'UNFINISHED'
         self._player_turn = 'white'
-        self._captured = []
-        self._wk_position = 'a1'
-        self._bk_position = 'h1'
+        self._captured = bytearray(len(PIECE_CODES))  # _captured[code] is number of pieces of that code captured
+        self._wk_sq = STARTING_BOARD.index(WK)  # 'a1'
+        self._bk_sq = STARTING_BOARD.index(BK)  # 'h1'
         self._wk_at_end = False
         self._bk_at_end = False
-        self._index_val = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7,
-                           '8': 0, '7': 1, '6': 2, '5': 3, '4': 4, '3': 5, '2': 6, '1': 7}
+        self._undo_stack = []  # one record per move made by push, for pop to undo
+        self._index_position()
+
+    def reset(self):
+        """Puts this game back in the starting position, as if newly created. Faster than creating a new ChessVar, as
+        the starting board, hash and occupancy are copied from a starting game built once per class."""
+        start = type(self)._starting_game()
+        self._board[:] = start._board
+        self._game_state = 'UNFINISHED'
+        self._player_turn = 'white'
+        self._captured = bytearray(len(PIECE_CODES))
+        self._wk_sq = start._wk_sq
+        self._bk_sq = start._bk_sq
+        self._wk_at_end = False
+        self._bk_at_end = False
+        self._undo_stack = []
+        self._copy_index(start)
+
+    @classmethod
+    def _starting_game(cls):
+        """Returns a game of this class in the starting position, created on first call and kept for reset to copy"""
+        if '_starting' not in cls.__dict__:  # one per class, so a subclass doesn't copy ChessVar's
+            cls._starting = cls()
+        return cls._starting
+
+    def _copy_index(self, other):
+        """Copies hash and occupancy from other, a game whose _board equals this one's"""
+        self._hash = other._hash
+        self._occupied = other._occupied
+
+    def _load_position(self, board, player_turn, wk_at_end, bk_at_end, game_state):
+        """Sets up this game in the given position, as __init__ does for the starting one: board is a bytearray of the
+        64 piece codes in square order, player_turn 'white' or 'black'. King positions are found on the board, and
+        captured pieces are whichever of the starting pieces are missing from it. Raises ValueError if either color has
+        no king or more than one, or a king flagged as having reached the top row is not on it."""
+        if board.count(WK) != 1 or board.count(BK) != 1:
+            raise ValueError('position must have exactly one king of each color')
+        if wk_at_end and board.index(WK) >= COLUMNS or bk_at_end and board.index(BK) >= COLUMNS:
+            raise ValueError('a king flagged as having reached the top row must be on it')
+        captured = bytearray(len(PIECE_CODES))
+        for code in range(1, len(PIECE_CODES)):
+            captured[code] = max(STARTING_BOARD.count(code) - board.count(code), 0)
+
+        self._board = board
+        self._game_state = game_state
+        self._player_turn = player_turn
+        self._captured = captured
+        self._wk_sq = board.index(WK)
+        self._bk_sq = board.index(BK)
+        self._wk_at_end = wk_at_end
+        self._bk_at_end = bk_at_end
+        self._undo_stack = []
+        self._index_position()
+
+    def to_fen(self):
+        """Returns compact string describing the current position, in four space-separated fields: the board from row 8
+        to row 1 with rows separated by '/', pieces as letters (white upper case: K king, R rook, B bishop, H knight;
+        black lower case) and runs of empty squares as digits; whose turn it is ('w' or 'b'); which kings have reached
+        row 8 ('W', 'B', 'WB', or '-' for neither); and the game state. The starting position is
+        '8/8/8/8/8/8/RBH2hbr/KBH2hbk w - UNFINISHED'."""
+        rows = []
+        for row in range(ROWS):
+            text = ''
+            empty = 0
+            for code in self._board[row * COLUMNS:(row + 1) * COLUMNS]:
+                if code == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                text += FEN_LETTERS[PIECE_CODES[code]]
+            if empty:
+                text += str(empty)
+            rows.append(text)
+        at_end = ('W' if self._wk_at_end else '') + ('B' if self._bk_at_end else '')
+        return '%s %s %s %s' % ('/'.join(rows), self._player_turn[0], at_end or '-', self._game_state)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Returns new game in the position described by fen, a string returned by to_fen. Much faster than replaying
+        the moves that led to the position. Raises ValueError if fen is not a valid position."""
+        fields = fen.split()
+        if len(fields) != 4 or fields[1] not in ('w', 'b') or fields[2] not in ('-', 'W', 'B', 'WB') or \
+                fields[3] not in GAME_STATES:
+            raise ValueError('invalid position string: %r' % fen)
+        board = _parse_board(fields[0], ROWS, COLUMNS)
+        game = cls.__new__(cls)
+        game._load_position(board, 'white' if fields[1] == 'w' else 'black', 'W' in fields[2], 'B' in fields[2],
+                            fields[3])
+        return game
+
+    def to_bytes(self):
+        """Returns the current position packed into 24 bytes, for bulk storage: an 8-byte bitmask of occupied squares
+        (bit n for square n, where 'a8' is 0 and 'h1' is 63), then one 4-bit piece code per occupied square in square
+        order (15 bytes, room for 30 pieces), then one byte of flags: bit 0 set if black's turn, bits 1 and 2 set if
+        the white and black kings have reached row 8, bits 3-4 the game state."""
+        codes = [code for code in self._board if code != EMPTY]
+        if len(codes) > PACKED_PIECES:
+            raise ValueError('too many pieces to pack into %d bytes' % RECORD_BYTES)
+        codes.extend([0] * (PACKED_PIECES - len(codes)))
+        packed = bytes(codes[i] << 4 | codes[i + 1] for i in range(0, PACKED_PIECES, 2))
+        flags = ((self._player_turn == 'black') | self._wk_at_end << 1 | self._bk_at_end << 2 |
+                 GAME_STATES.index(self._game_state) << 3)
+        return self._occupied.to_bytes(OCCUPANCY_BYTES, 'big') + packed + bytes((flags,))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Returns new game in the position packed into data, 24 bytes returned by to_bytes. Raises ValueError if data
+        is not a valid position."""
+        if len(data) != RECORD_BYTES:
+            raise ValueError('packed position must be %d bytes, got %d' % (RECORD_BYTES, len(data)))
+        occupied = int.from_bytes(data[:OCCUPANCY_BYTES], 'big')
+        codes = []
+        for byte in data[OCCUPANCY_BYTES:RECORD_BYTES - 1]:
+            codes.append(byte >> 4)
+            codes.append(byte & 15)
+        flags = data[RECORD_BYTES - 1]
+        if flags >> 3 >= len(GAME_STATES) or bin(occupied).count('1') > PACKED_PIECES or \
+                occupied >> BOARD_SQUARES:
+            raise ValueError('invalid packed position')
+        board = bytearray(BOARD_SQUARES)
+        index = 0
+        for square in range(BOARD_SQUARES):
+            if occupied >> square & 1:
+                if not 1 <= codes[index] < len(PIECE_CODES):
+                    raise ValueError('invalid piece code in packed position')
+                board[square] = codes[index]
+                index += 1
+        game = cls.__new__(cls)
+        game._load_position(board, 'black' if flags & 1 else 'white', bool(flags & 2), bool(flags & 4),
+                            GAME_STATES[flags >> 3])
+        return game
+
+    def _index_position(self):
+        """Builds the Zobrist hash and the bitmask of occupied squares from _board. Afterwards they are kept up to date
+        move by move by _place, so this is only needed when _board is filled in some other way."""
+        self._hash = self._board_hash()
+        occupied = 0
+        for square, piece in enumerate(self._board):
+            if piece != EMPTY:
+                occupied |= 1 << square
+        self._occupied = occupied
+
+    def _board_hash(self):
+        """Returns Zobrist hash of the pieces on _board: the XOR of the ZOBRIST key of every piece on its square"""
+        board_hash = 0
+        for square, piece in enumerate(self._board):
+            if piece != EMPTY:
+                board_hash ^= ZOBRIST[piece][square]
+        return board_hash
+
+    def position_key(self):
+        """Returns 64-bit Zobrist key identifying the current position: the pieces on the board, whose turn it is, which
+        kings have reached row 8, and the game state. Equal positions reached by different move orders get equal keys.
+        The piece part is updated move by move, so this costs a few XORs."""
+        key = self._hash ^ ZOBRIST_GAME_STATE[self._game_state]
+        if self._player_turn == 'black':
+            key ^= ZOBRIST_BLACK_TURN
+        if self._wk_at_end is True:
+            key ^= ZOBRIST_WK_AT_END
+        if self._bk_at_end is True:
+            key ^= ZOBRIST_BK_AT_END
+        return key
 
     def get_game_state(self):
         """Returns current game state, which can be one of the following: UNFINISHED, BLACK_WON, WHITE_WON, or TIE"""
@@ -38,440 +431,555 @@ class ChessVar:
 
     def get_board(self):
         """Prints visual of current board given all successful moves made"""
-        for row in range(len(self._board)):
-            print(self._board[row]), '\n'
+        for row in range(ROWS):
+            print([PIECE_CODES[code] for code in self._board[row * COLUMNS:(row + 1) * COLUMNS]])
 
     def get_player_turn(self):
         """Returns current player's turn"""
         return self._player_turn
 
-    def make_move(self, from_square, to_square):
-        """Performs entered move given that all tests pass, proving its validity. If initial tests pass, appropriate
-        method is called to perform more tests specific to the piece being moved."""
-        column_1 = self._index_val[from_square[0]]
-        row_1 = self._index_val[from_square[1]]
-        column_2 = self._index_val[to_square[0]]
-        row_2 = self._index_val[to_square[1]]
+    def get_captured(self):
+        """Returns list of piece strings captured so far, e.g. ['bh', 'wr'], in PIECE_CODES order"""
+        return [piece for code, piece in enumerate(PIECE_CODES) for _ in range(self._captured[code])]
+
+    def legal_moves(self):
+        """Returns list of Move objects (from MOVES), one for every move make_move_sq would accept from player whose
+        turn it is. Candidate squares come from each piece's own movement rules, then are filtered with king_check_sq
+        and king_final_check_sq exactly as is_legal_sq does. Returns empty list if game is over."""
+        if self._game_state != 'UNFINISHED':
+            return []
+        color = self._player_turn[0]
+        if color == 'w':
+            own_king_sq = self._wk_sq
+            other_king_sq = self._bk_sq
+        else:
+            own_king_sq = self._bk_sq
+            other_king_sq = self._wk_sq
+
+        board = self._board
+        moves = []
+        for from_sq in range(BOARD_SQUARES):
+            piece = board[from_sq]
+            if PIECE_COLOR[piece] != color:  # empty square or opponent's piece
+                continue
+            kind = PIECE_KIND[piece]
+            from_moves = MOVES[from_sq]
+            targets = self._targets(from_sq, kind)
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                to_sq = bit.bit_length() - 1
+                target = board[to_sq]
+                if target != EMPTY and (PIECE_COLOR[target] == color or target == WK or target == BK):
+                    continue  # own piece or opponent's king
+                if kind == 'k':
+                    # same tests as _king_move_legal: kings not adjacent, neither king exposed to check
+                    if self.king_check_sq(other_king_sq, from_sq, to_sq) is False:
+                        continue
+                    if self.king_final_check_sq(other_king_sq, from_sq, to_sq) is False:
+                        continue
+                    if self.king_final_check_sq(to_sq, from_sq, to_sq) is False:
+                        continue
+                else:
+                    # same tests as _kings_safe: neither king exposed to check
+                    if self.king_final_check_sq(own_king_sq, from_sq, to_sq) is False:
+                        continue
+                    if self.king_final_check_sq(other_king_sq, from_sq, to_sq) is False:
+                        continue
+                moves.append(from_moves[to_sq])
+        return moves
+
+    def _targets(self, square, kind):
+        """Returns bitmask of squares the piece of kind ('k', 'r', 'b' or 'h') on 0-63 square could move to by its
+        movement rules, including squares holding pieces it may not capture. A rook or bishop's path stops at the first
+        piece in it (no jumping)."""
+        if kind == 'k':
+            return KING_ATTACKS[square]
+        if kind == 'h':
+            return KNIGHT_ATTACKS[square]
+        if kind == 'r':
+            return rook_attacks(square, self._occupied)
+        return bishop_attacks(square, self._occupied)
+
+    def push(self, move):
+        """Makes move, a Move of this game's board or a (from_square, to_square) tuple such as ('a1', 'a2'), through
+        make_move_sq. If make_move_sq accepts it, records what pop needs to undo it: the squares, the captured piece (or
+        EMPTY), both king positions, both at-end flags, the game state and the player turn. Returns make_move_sq's
+        result. Raises ValueError for a Move of another board (see _move_squares)."""
+        if isinstance(move, Move):
+            from_sq, to_sq = self._move_squares(move)
+        else:
+            from_sq = SQUARE_INDEX[move[0]]
+            to_sq = SQUARE_INDEX[move[1]]
+        record = (from_sq, to_sq, self._board[to_sq], self._wk_sq, self._bk_sq, self._wk_at_end, self._bk_at_end,
+                  self._game_state, self._player_turn)
+        if self.make_move_sq(from_sq, to_sq) is True:
+            self._undo_stack.append(record)
+            return True
+        return False
+
+    def pop(self):
+        """Undoes the last move made by push, restoring the board, captured pieces, king positions, at-end flags, game
+        state and player turn to what they were before it. Returns the undone (from_square, to_square) move. Raises
+        IndexError if there is no pushed move left to undo."""
+        from_sq, to_sq, captured, wk_sq, bk_sq, wk_at_end, bk_at_end, game_state, player_turn = self._undo_stack.pop()
+        self._place(from_sq, self._board[to_sq])  # move piece back
+        self._place(to_sq, captured)  # put back captured piece/blank space
+        if captured != EMPTY:
+            self._captured[captured] -= 1
+        self._wk_sq = wk_sq
+        self._bk_sq = bk_sq
+        self._wk_at_end = wk_at_end
+        self._bk_at_end = bk_at_end
+        self._game_state = game_state
+        self._player_turn = player_turn
+        return SQUARES[from_sq], SQUARES[to_sq]
+
+    def play(self, move):
+        """Performs move, a Move such as those returned by legal_moves, if it is valid. Same as make_move_sq. Raises
+        ValueError for a Move of another board (see _move_squares)."""
+        return self.make_move_sq(*self._move_squares(move))
+
+    def _move_squares(self, move):
+        """Returns (from_sq, to_sq) of move if it is a Move of this game's board: one of its MOVES, or naming the same
+        squares. Raises ValueError otherwise, e.g. for Move.parse('a2a3') on a 10x10 board, whose square numbers name
+        other squares there (use RULES.parse_move)."""
+        from_sq = move.from_sq
+        to_sq = move.to_sq
+        if from_sq < BOARD_SQUARES and to_sq < BOARD_SQUARES and (MOVES[from_sq][to_sq] is move or (
+                SQUARES[from_sq], SQUARES[to_sq]) == (move.from_square, move.to_square)):
+            return from_sq, to_sq
+        raise ValueError('%r is not a move of this board: use RULES.parse_move or legal_moves' % move)
+
+    def make_move_sq(self, from_sq, to_sq):
+        """Performs move from 0-63 square from_sq to to_sq given that all tests pass (see is_legal_sq), proving its
+        validity. If move passes, move is recorded, piece is captured (if any), game state updated if game ends, or
+        player turn changes (if game not over), and True is returned. Otherwise, returns False."""
+        if self.is_legal_sq(from_sq, to_sq) is False:
+            return False
+        if PIECE_KIND[self._board[from_sq]] == 'k':
+            self._record_king_move(from_sq, to_sq)
+        else:
+            self._record_move(from_sq, to_sq)
+        return True
+
+    def is_legal_sq(self, from_sq, to_sq):
+        """Returns True if make_move_sq would accept the move from 0-63 square from_sq to to_sq, otherwise False,
+        without making it. If initial tests pass, appropriate method is called to perform more tests specific to the
+        piece being moved. Exposure to check is worked out from the occupancy the move would leave rather than by
+        trying the move, so the game is only read, never changed: any number of threads or tasks may screen moves on the
+        same position at once, as long as no move is being made meanwhile."""
+        piece = self._board[from_sq]
+        target = self._board[to_sq]
         # initial checks
-        if self._board[row_1][column_1][0] != self._player_turn[0]:  # if piece not of player whose turn it is/no piece
+        if PIECE_COLOR[piece] != self._player_turn[0]:  # if piece not of player whose turn it is/no piece
             return False
-        if self._game_state == 'WHITE_WON' or self._game_state == 'BLACK_WON' or self._game_state == 'TIE':  # game over
+        if self._game_state != 'UNFINISHED':  # game over
             return False
-        if self._board[row_2][column_2] != '  ' and self._board[row_2][column_2][0] == self._player_turn[0]:
-            return False  # if trying to move onto where one's own piece is
-        if self._board[row_2][column_2] != '  ' and self._board[row_2][column_2][1] == 'k':  # can't capture opp's king
+        if PIECE_COLOR[target] == self._player_turn[0]:  # if trying to move onto where one's own piece is
+            return False
+        if target == WK or target == BK:  # can't capture opp's king
             return False
 
-        if self._board[row_1][column_1][1] == 'k':  # if piece trying to move is a KING
-            return self.king_move(from_square, to_square)
-        elif self._board[row_1][column_1][1] == 'r':  # if piece trying to move is a ROOK
-            return self.rook_move(from_square, to_square)
-        elif self._board[row_1][column_1][1] == 'b':  # if piece trying to move is a BISHOP
-            return self.bishop_move(from_square, to_square)
-        elif self._board[row_1][column_1][1] == 'h':  # if piece trying to move is a KNIGHT
-            return self.knight_move(from_square, to_square)
-
-    def king_move(self, from_square, to_square):  # moves one square at a time, any direction
-        """Specific tests to check validity of proposed move by king. Some tests performed by calling king_check and
-        king_final_check methods. If move passes, move is recorded, piece is captured (if any), game state updated if
-        ends, or player turn changes (if game not over), and True is returned. Otherwise, returns False."""
-        column_1 = self._index_val[from_square[0]]
-        row_1 = self._index_val[from_square[1]]
-        column_2 = self._index_val[to_square[0]]
-        row_2 = self._index_val[to_square[1]]
-
-        if abs(column_2 - column_1) > 1 or abs(row_2 - row_1) > 1:  # if try to move king by more than one square
+        kind = PIECE_KIND[piece]
+        if kind == 'k':  # if piece trying to move is a KING
+            return self._king_move_legal(from_sq, to_sq)
+        elif kind == 'r':  # if piece trying to move is a ROOK
+            return self._rook_move_legal(from_sq, to_sq)
+        elif kind == 'b':  # if piece trying to move is a BISHOP
+            return self._bishop_move_legal(from_sq, to_sq)
+        return self._knight_move_legal(from_sq, to_sq)  # piece trying to move is a KNIGHT
+
+    def _king_move_legal(self, from_sq, to_sq):  # moves one square at a time, any direction
+        """Specific tests to check validity of proposed move by king. Some tests performed by calling king_check_sq and
+        king_final_check_sq methods. Returns True if all pass, otherwise False."""
+        if not KING_ATTACKS[from_sq] >> to_sq & 1:  # if try to move king by more than one square
             return False
 
         if self._player_turn == 'white':
-            other_king_pos = self._bk_position
+            other_king_sq = self._bk_sq
         else:
-            other_king_pos = self._wk_position
+            other_king_sq = self._wk_sq
 
         # if move exposes any king to check
-        if self.king_check(other_king_pos, from_square, to_square) is False:
+        if self.king_check_sq(other_king_sq, from_sq, to_sq) is False:
+            return False
+        if self.king_final_check_sq(other_king_sq, from_sq, to_sq) is False:
+            return False
+        if self.king_final_check_sq(to_sq, from_sq, to_sq) is False:
             return False
-        if self.king_final_check(other_king_pos, from_square, to_square) is False:
+        return True
+
+    def _rook_move_legal(self, from_sq, to_sq):  # moves straight in any direction, as far as it can (no jumping)
+        """Specific tests to check validity of proposed move by rook: it must move along a row or column without
+        jumping over any piece, and not expose either king to check. Returns True if all pass, otherwise False."""
+        if not 0 <= DIRECTION[from_sq][to_sq] < 4:  # if rook trying to move not straight - illegal move
+            return False
+        if BETWEEN[from_sq][to_sq] & self._occupied:  # if trying to jump over other pieces
+            return False
+        return self._kings_safe(from_sq, to_sq)
+
+    def _bishop_move_legal(self, from_sq, to_sq):  # moves only diagonally, as far as it can (no jumping)
+        """Specific tests to check validity of proposed move by bishop: it must move diagonally without jumping over any
+        piece, and not expose either king to check. Returns True if all pass, otherwise False."""
+        if DIRECTION[from_sq][to_sq] < 4:  # if attempt moving non-diagonally
+            return False
+        if BETWEEN[from_sq][to_sq] & self._occupied:  # if attempting jumping over pieces
+            return False
+        return self._kings_safe(from_sq, to_sq)
+
+    def _knight_move_legal(self, from_sq, to_sq):  # moves in L-shape, can jump over
+        """Specific tests to check validity of proposed move by knight: it must move in an L-shape, and not expose
+        either king to check. Returns True if all pass, otherwise False."""
+        if not KNIGHT_ATTACKS[from_sq] >> to_sq & 1:  # if move is not an L-shape
+            return False
+        return self._kings_safe(from_sq, to_sq)
+
+    def _kings_safe(self, from_sq, to_sq):
+        """Returns False if moving the rook, bishop or knight on from_sq to to_sq would expose either king to check,
+        tested by calling king_final_check_sq method, otherwise True"""
+        if self.king_final_check_sq(self._wk_sq, from_sq, to_sq) is False:
             return False
-        if self.king_final_check(to_square, from_square, to_square) is False:
+        if self.king_final_check_sq(self._bk_sq, from_sq, to_sq) is False:
             return False
+        return True
 
-        if self._board[row_2][column_2] != '  ':  # if piece to be captured
-            self._captured.append(self._board[row_2][column_2])  # add to list of captured
-        self._board[row_2][column_2] = self._board[row_1][column_1]  # move piece to new square
-        self._board[row_1][column_1] = '  '  # free previous square
+    def king_move_sq(self, from_sq, to_sq):
+        """Makes proposed king move if it passes the king's tests (see _king_move_legal), returning True, otherwise
+        returns False"""
+        if self._king_move_legal(from_sq, to_sq) is False:
+            return False
+        self._record_king_move(from_sq, to_sq)
+        return True
+
+    def rook_move_sq(self, from_sq, to_sq):
+        """Makes proposed rook move if it passes the rook's tests (see _rook_move_legal), returning True, otherwise
+        returns False"""
+        if self._rook_move_legal(from_sq, to_sq) is False:
+            return False
+        self._record_move(from_sq, to_sq)
+        return True
+
+    def bishop_move_sq(self, from_sq, to_sq):
+        """Makes proposed bishop move if it passes the bishop's tests (see _bishop_move_legal), returning True,
+        otherwise returns False"""
+        if self._bishop_move_legal(from_sq, to_sq) is False:
+            return False
+        self._record_move(from_sq, to_sq)
+        return True
+
+    def knight_move_sq(self, from_sq, to_sq):
+        """Makes proposed knight move if it passes the knight's tests (see _knight_move_legal), returning True,
+        otherwise returns False"""
+        if self._knight_move_legal(from_sq, to_sq) is False:
+            return False
+        self._record_move(from_sq, to_sq)
+        return True
+
+    def _record_king_move(self, from_sq, to_sq):
+        """Makes king move that has passed all tests: piece is captured (if any), king position updated, and game state
+        updated if game ends, or player turn changes (if game not over)"""
+        self._move_piece(from_sq, to_sq)  # capture (if any) and move piece
 
         if self._player_turn == 'black':
-            self._bk_position = to_square  # updating king position
+            self._bk_sq = to_sq  # updating king position
             if self._wk_at_end is True:
-                if row_2 != 0:
+                if to_sq >= COLUMNS:  # not on row 8
                     self._game_state = 'WHITE_WON'
-
                 else:
                     self._bk_at_end = True
                     self._game_state = 'TIE'
-
             else:
-                if row_2 == 0:
+                if to_sq < COLUMNS:
                     self._bk_at_end = True
                     self._game_state = 'BLACK_WON'
                 else:
                     self._player_turn = 'white'  # change player turn
-            return True
-
-        if self._player_turn == 'white':
-            self._wk_position = to_square  # updating king position
-            if row_2 == 0:
-                self._wk_at_end = True
-            self._player_turn = 'black'  # change player turn
-            return True
-
-    def rook_move(self, from_square, to_square):  # moves straight in any direction, as far as it can (no jumping)
-        """Specific tests to check validity of proposed move by rook. Some tests performed by calling king_final_check
-        method. If move passes, move is recorded, piece is captured (if any), game state updated if game ends, or player
-         turn changes (if game not over), and True is returned. Otherwise, returns False."""
-        column_1 = self._index_val[from_square[0]]
-        row_1 = self._index_val[from_square[1]]
-        column_2 = self._index_val[to_square[0]]
-        row_2 = self._index_val[to_square[1]]
-
-        if column_1 != column_2 and row_1 != row_2:  # if rook trying to move not straight - illegal move
-            return False
-
-        if column_1 < column_2:  # if moving right within row (so row_1 == row_2)
-            for square in range(column_1 + 1, column_2):
-                if self._board[row_1][square] != '  ':  # if trying to jump over other pieces
-                    return False
-
-        if row_1 < row_2:  # if moving within column, down (so column_1 == column_2)
-            for square in range(row_1 + 1, row_2):
-                if self._board[square][column_1] != '  ':  # if trying to jump over other pieces
-                    return False
+            return
 
-        if column_1 > column_2:  # if moving left within row (so row_1 == row_2)
-            for square in range(column_1 - 1, column_2, -1):
-                if self._board[row_1][square] != '  ':  # if trying to jump over other pieces
-                    return False
+        self._wk_sq = to_sq  # updating king position
+        if to_sq < COLUMNS:
+            self._wk_at_end = True
+        self._player_turn = 'black'  # change player turn
 
-        if row_1 > row_2:  # if moving within column, up (so column_1 == column_2)
-            for square in range(row_1 - 1, row_2, -1):
-                if self._board[square][column_1] != '  ':  # if trying to jump over other pieces
-                    return False
-
-        # if desired move puts a king in check
-        if self.king_final_check(self._wk_position, from_square, to_square) is False:
-            return False
-        if self.king_final_check(self._bk_position, from_square, to_square) is False:
-            return False
-
-        if self._board[row_2][column_2] != '  ':  # if piece to be captured
-            self._captured.append(self._board[row_2][column_2])  # add to list of captured
-        self._board[row_2][column_2] = self._board[row_1][column_1]  # move piece to new square
-        self._board[row_1][column_1] = '  '  # free previous square
+    def _record_move(self, from_sq, to_sq):
+        """Makes rook, bishop or knight move that has passed all tests: piece is captured (if any), and game state
+        updated if game ends, or player turn changes (if game not over)"""
+        self._move_piece(from_sq, to_sq)  # capture (if any) and move piece
 
         if self._wk_at_end is True:
             self._game_state = 'WHITE_WON'
-            return True
+            return
 
         if self._player_turn == 'white':  # change player turn
             self._player_turn = 'black'
         else:
             self._player_turn = 'white'
-        return True
 
-    def bishop_move(self, from_square, to_square):  # moves only diagonally, as far as it can (no jumping)
-        """Specific tests to check validity of proposed move by bishop. Some tests performed by calling king_final_check
-        method. If move passes, move is recorded, piece is captured (if any), game state updated if game ends, or player
-         turn changes (if game not over), and True is returned. Otherwise, returns False."""
-        column_1 = self._index_val[from_square[0]]
-        row_1 = self._index_val[from_square[1]]
-        column_2 = self._index_val[to_square[0]]
-        row_2 = self._index_val[to_square[1]]
-
-        # if abs(column_2 - column_1) / abs(row_2 - row_1) != 1:
-        if abs(column_2 - column_1) != abs(row_2 - row_1):  # if attempt moving non-diagonally (checks slope)
+    def _move_piece(self, from_sq, to_sq):
+        """Moves piece from first square to second, adding any piece on second square to count of captured. Does no
+        validity tests, so only called once a move has passed all of them."""
+        if self._board[to_sq] != EMPTY:  # if piece to be captured
+            self._captured[self._board[to_sq]] += 1  # add to count of captured
+        self._place(to_sq, self._board[from_sq])  # move piece to new square
+        self._place(from_sq, EMPTY)  # free previous square
+
+    def _place(self, square, piece):
+        """Puts piece code piece (or EMPTY for none) on 0-63 square, updating the occupancy bitmask and the Zobrist
+        hash"""
+        old_piece = self._board[square]
+        self._hash ^= ZOBRIST[old_piece][square] ^ ZOBRIST[piece][square]
+        self._board[square] = piece
+        if (old_piece == EMPTY) != (piece == EMPTY):  # square changes between empty and occupied
+            self._occupied ^= 1 << square
+
+    def king_check_sq(self, king_sq, from_sq, to_sq):
+        """Tests if proposed move of a king to to_sq would put it one space away from the other king, on king_sq (kings
+        may not be adjacent). If so, returns False."""
+        if KING_ATTACKS[king_sq] >> to_sq & 1:  # if one space away horizontally, vertically or diagonally
             return False
-
-        if column_2 > column_1 and row_2 > row_1:  # moving down right diagonally
-            for chn in range(1, column_2 - column_1):  # chn = change
-                if self._board[row_1 + chn][column_1 + chn] != '  ':  # if attempting jumping over pieces
-                    return False
-        if column_2 < column_1 and row_2 < row_1:  # moving left up diagonally
-            for chn in range(1, abs(column_2 - column_1)):
-                if self._board[row_1 - chn][column_1 - chn] != '  ':  # if attempting jumping over pieces
-                    return False
-        if column_2 > column_1 and row_2 < row_1:  # moving right up diagonally
-            for chn in range(1, abs(column_2 - column_1)):
-                if self._board[row_1 - chn][column_1 + chn] != '  ':  # if attempting jumping over pieces
-                    return False
-        if column_2 < column_1 and row_2 > row_1:  # moving down left diagonally
-            for chn in range(1, abs(column_2 - column_1)):
-                if self._board[row_1 + chn][column_1 - chn] != '  ':
-                    return False
-
-        # if desired move puts a king in check
-        if self.king_final_check(self._wk_position, from_square, to_square) is False:
-            return False
-        if self.king_final_check(self._bk_position, from_square, to_square) is False:
-            return False
-
-        if self._board[row_2][column_2] != '  ':  # if piece to be captured
-            self._captured.append(self._board[row_2][column_2])  # add to list of captured
-        self._board[row_2][column_2] = self._board[row_1][column_1]  # move piece to new square
-        self._board[row_1][column_1] = '  '  # free previous square
-
-        if self._wk_at_end is True:
-            self._game_state = 'WHITE_WON'
-            return True
-
-        if self._player_turn == 'white':  # change player turn
-            self._player_turn = 'black'
-        else:
-            self._player_turn = 'white'
         return True
 
-    def knight_move(self, from_square, to_square):  # moves in L-shape, can jump over
-        """Specific tests to check validity of proposed move by knight. Some tests performed by calling king_final_check
-        method. If move passes, move is recorded, piece is captured (if any), game state updated if game ends, or player
-         turn changes (if game not over), and True is returned. Otherwise, returns False."""
-        column_1 = self._index_val[from_square[0]]
-        row_1 = self._index_val[from_square[1]]
-        column_2 = self._index_val[to_square[0]]
-        row_2 = self._index_val[to_square[1]]
-        l_check_1 = abs(column_2 - column_1) == 2 and abs(row_2 - row_1) == 1
-        l_check_2 = abs(row_2 - row_1) == 2 and abs(column_2 - column_1) == 1
-        l_check = l_check_1 or l_check_2  # checks for L-shape
-
-        if l_check is False:  # if move is not an L-shape
+    def king_final_check_sq(self, king_sq, from_sq, to_sq):  # king_sq is king's square after the move
+        """Tests if proposed move by piece in question would expose either king to check. Rather than faking the move,
+        works out the occupancy it would leave and looks from the king's square along its rays and knight hops for an
+        enemy rook, bishop or knight, with the moved piece on to_sq and nothing on from_sq. If a test fails, returns
+        False."""
+        piece = self._board[from_sq]
+        if king_sq == to_sq:  # king being tested is the one moving
+            king = piece
+        else:
+            king = self._board[king_sq]
+        if king != WK and king != BK:  # only a king can be exposed to check
+            return True
+        occupied = (self._occupied & ~(1 << from_sq)) | (1 << to_sq)  # occupancy once move is made
+        if self._attacked_on_board(king_sq, occupied, 'b' if king == WK else 'w', to_sq, piece):
             return False
+        return True
 
-        # if desired move puts a king in check
-        if self.king_final_check(self._wk_position, from_square, to_square) is False:
-            return False
-        if self.king_final_check(self._bk_position, from_square, to_square) is False:
+    def _attacked_on_board(self, square, occupied, color, to_sq, piece):
+        """Returns True if a rook, bishop or knight of color ('w' or 'b') attacks 0-63 square, given bitmask of occupied
+        squares, taking to_sq to hold piece code piece whatever is on the board there. This lets a move be tested by
+        passing the occupancy and piece it would leave, without making it. A rook or bishop's path stops at the first
+        occupied square."""
+        rook, bishop, knight = ATTACKERS[color]
+        board = self._board
+        to_bit = 1 << to_sq
+        for candidates, attacker in ((KNIGHT_ATTACKS[square] & occupied, knight),
+                                     (rook_attacks(square, occupied) & occupied, rook),
+                                     (bishop_attacks(square, occupied) & occupied, bishop)):
+            if candidates & to_bit:
+                if piece == attacker:
+                    return True
+                candidates ^= to_bit
+            while candidates:
+                bit = candidates & -candidates
+                candidates ^= bit
+                if board[bit.bit_length() - 1] == attacker:
+                    return True
+        return False
+
+    def _square_attacked(self, square, color):
+        """Returns True if any rook, bishop or knight of color ('w' or 'b') attacks 0-63 square"""
+        return self._attacked_on_board(square, self._occupied, color, square, self._board[square])
+
+    def _attacked_by_kind(self, square, kind):
+        """Returns True if king on 0-63 square is attacked by an opponent's piece of the given kind ('r', 'b' or 'h'),
+        on the current board"""
+        king = self._board[square]
+        if king != WK and king != BK:
             return False
+        attacker = ATTACKERS['b' if king == WK else 'w']['rbh'.index(kind)]
+        if kind == 'h':
+            candidates = KNIGHT_ATTACKS[square]
+        elif kind == 'r':
+            candidates = rook_attacks(square, self._occupied)
+        else:
+            candidates = bishop_attacks(square, self._occupied)
+        candidates &= self._occupied
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            if self._board[bit.bit_length() - 1] == attacker:
+                return True
+        return False
+
+    # Methods taking algebraic squares such as 'a1': each parses its squares and calls the square-numbered method above
+
+    def generate_legal_moves(self):
+        """Returns list of (from_square, to_square) tuples, one for every move make_move would accept from player whose
+        turn it is, e.g. ('a1', 'a2'). Returns empty list if game is over."""
+        return [(move.from_square, move.to_square) for move in self.legal_moves()]
 
-        if self._board[row_2][column_2] != '  ':  # if piece to be captured
-            self._captured.append(self._board[row_2][column_2])  # add to list of captured
-        self._board[row_2][column_2] = self._board[row_1][column_1]  # move piece to new square
-        self._board[row_1][column_1] = '  '  # free previous square
+    def make_move(self, from_square, to_square):
+        """Performs entered move given that all tests pass, proving its validity (see make_move_sq). Returns True if
+        the move is made, otherwise False."""
+        return self.make_move_sq(SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
 
-        if self._wk_at_end is True:
-            self._game_state = 'WHITE_WON'
-            return True
+    def is_legal(self, from_square, to_square):
+        """Returns True if make_move would accept entered move, otherwise False, without making it or changing the game
+        in any way (see is_legal_sq)"""
+        return self.is_legal_sq(SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
 
-        if self._player_turn == 'white':  # change player turn
-            self._player_turn = 'black'
-        else:
-            self._player_turn = 'white'
-        return True
+    def king_move(self, from_square, to_square):
+        """Makes proposed king move if valid (see king_move_sq)"""
+        return self.king_move_sq(SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
 
-    def king_check(self, position, from_square, to_square):
-        """Tests if proposed move would put expose each king to check by the other (one space away from each other). If
-        a test fails, returns False."""
-        column_0 = self._index_val[position[0]]  # position: of king not getting moved
-        row_0 = self._index_val[position[1]]
-        column_1 = self._index_val[from_square[0]]
-        row_1 = self._index_val[from_square[1]]
-        column_2 = self._index_val[to_square[0]]  # to_square: proposed position of king player is attempting to move
-        row_2 = self._index_val[to_square[1]]
-
-        # faking move to test
-        temp_hold = self._board[row_2][column_2]  # holding 'captured' piece/blank space
-        self._board[row_2][column_2] = self._board[row_1][column_1]
-        self._board[row_1][column_1] = '  '
-
-        if abs(column_2 - column_0) == 1 and row_2 - row_0 == 0:  # if one space away horizontally
-            self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move
-            self._board[row_2][column_2] = temp_hold
-            return False
-        if column_2 - column_0 == 0 and abs(row_2 - row_0) == 1:  # if one space away vertically
-            self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move
-            self._board[row_2][column_2] = temp_hold
-            return False
-        if abs(column_2 - column_0) == 1 and abs(row_2 - row_0) == 1:  # if one space away diagonally
-            self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move
-            self._board[row_2][column_2] = temp_hold
-            return False
+    def rook_move(self, from_square, to_square):
+        """Makes proposed rook move if valid (see rook_move_sq)"""
+        return self.rook_move_sq(SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
 
-        self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move regardless
-        self._board[row_2][column_2] = temp_hold
+    def bishop_move(self, from_square, to_square):
+        """Makes proposed bishop move if valid (see bishop_move_sq)"""
+        return self.bishop_move_sq(SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
 
-    def king_final_check(self, position, from_square, to_square):  # position is king's position
-        """Tests if proposed move by piece in question would expose either king to check. To perform tests, calls on
-        knight_check, bishop_check, and rook_check methods. If a test fails, returns False."""
-        column_1 = self._index_val[from_square[0]]
-        row_1 = self._index_val[from_square[1]]
-        column_2 = self._index_val[to_square[0]]  # to_square: proposed position of piece player is attempting to move
-        row_2 = self._index_val[to_square[1]]
-
-        # faking move to check against all pieces
-        temp_hold = self._board[row_2][column_2]  # holding 'captured' piece/blank space
-        self._board[row_2][column_2] = self._board[row_1][column_1]
-        self._board[row_1][column_1] = '  '
-
-        if self.knight_check(position) is False:
-            self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move
-            self._board[row_2][column_2] = temp_hold
-            return False
-        if self.bishop_check(position) is False:
-            self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move
-            self._board[row_2][column_2] = temp_hold
-            return False
-        if self.rook_check(position) is False:
-            self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move
-            self._board[row_2][column_2] = temp_hold
-            return False
+    def knight_move(self, from_square, to_square):
+        """Makes proposed knight move if valid (see knight_move_sq)"""
+        return self.knight_move_sq(SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
 
-        self._board[row_1][column_1] = self._board[row_2][column_2]  # undoing move regardless
-        self._board[row_2][column_2] = temp_hold
-
-    def rook_check(self, position):  # position: of king being tested for exposure to check from proposed move
-        """Testing if proposed move would put either king in check by a rook. If so, returns False."""
-        column = self._index_val[position[0]]
-        row = self._index_val[position[1]]
-
-        for chn in range(1, len(self._board)):  # chn = change, straight down
-            new_row = row + chn < len(self._board)
-            if new_row and self._board[row + chn][column] != '  ':  # testing if first piece in this path is opp's rook
-                if self._board[row][column] == 'wk' and self._board[row + chn][column] == 'br':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row + chn][column] == 'wr':
-                    return False
-                break  # if above doesn't return False, still stops this loop b/c don't need to keep going
-            if new_row is False:  # if out of bounds of board
-                break
-        for chn in range(1, len(self._board)):  # straight up
-            new_row = row - chn >= 0
-            if new_row and self._board[row - chn][column] != '  ':  # testing if first piece in this path is opp's rook
-                if self._board[row][column] == 'wk' and self._board[row - chn][column] == 'br':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row - chn][column] == 'wr':
-                    return False
-                break
-            if new_row is False:
-                break
-        for chn in range(1, len(self._board)):  # straight right
-            new_column = column + chn < len(self._board)
-            if new_column and self._board[row][column + chn] != '  ':  # testing if first piece in path is opp's rook
-                if self._board[row][column] == 'wk' and self._board[row][column + chn] == 'br':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row][column + chn] == 'wr':
-                    return False
-                break
-            if new_column is False:
-                break
-        for chn in range(1, len(self._board)):  # straight left
-            new_column = column - chn >= 0
-            if new_column and self._board[row][column - chn] != '  ':  # testing if first piece in path is opp's rook
-                if self._board[row][column] == 'wk' and self._board[row][column - chn] == 'br':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row][column - chn] == 'wr':
-                    return False
-                break
-            if new_column is False:
-                break
-        return True
-
-    def bishop_check(self, position):  # position: of king being tested for exposure to check from proposed move
-        """Testing if proposed move would put either king in check by a bishop. If so, returns False."""
-        column = self._index_val[position[0]]
-        row = self._index_val[position[1]]
-
-        for chn in range(1, len(self._board)):  # chn = change, down-right diagonal
-            new_row = row + chn < len(self._board)
-            new_column = column + chn < len(self._board)
-            if new_row and new_column and self._board[row + chn][column + chn] != '  ':
-                if self._board[row][column] == 'wk' and self._board[row + chn][column + chn] == 'bb':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row + chn][column + chn] == 'wb':
-                    return False
-                break
-            if new_row is False or new_column is False:
-                break
-        for chn in range(1, len(self._board)):  # up-left diagonal
-            new_row = row - chn >= 0
-            new_column = column - chn >= 0
-            if new_row and new_column and self._board[row - chn][column - chn] != '  ':
-                if self._board[row][column] == 'wk' and self._board[row - chn][column - chn] == 'bb':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row - chn][column - chn] == 'wb':
-                    return False
-                break
-            if new_row is False or new_column is False:
-                break
-        for chn in range(1, len(self._board)):  # up-right diagonal
-            new_row = row - chn >= 0
-            new_column = column + chn < len(self._board)
-            if new_row and new_column and self._board[row - chn][column + chn] != '  ':
-                if self._board[row][column] == 'wk' and self._board[row - chn][column + chn] == 'bb':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row - chn][column + chn] == 'wb':
-                    return False
-                break
-            if new_row is False or new_column is False:
-                break
-        for chn in range(1, len(self._board)):  # down-left diagonal
-            new_row = row + chn < len(self._board)
-            new_column = column - chn >= 0
-            if new_row and new_column and self._board[row + chn][column - chn] != '  ':
-                if self._board[row][column] == 'wk' and self._board[row + chn][column - chn] == 'bb':
-                    return False
-                if self._board[row][column] == 'bk' and self._board[row + chn][column - chn] == 'wb':
-                    return False
-                break
-            if new_row is False or new_column is False:
-                break
-        return True
+    def king_check(self, position, from_square, to_square):
+        """Tests if proposed king move would put it one space away from the other king, on position. If so, returns
+        False."""
+        return self.king_check_sq(SQUARE_INDEX[position], SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
 
-    def knight_check(self, position):  # position: of king being tested for exposure to check from proposed move
-        """Testing if proposed move would put either king in check by a knight. If so, returns False."""
-        column = self._index_val[position[0]]
-        row = self._index_val[position[1]]
-
-        row_less_1 = row - 1 >= 0  # tests if in bounds
-        row_less_2 = row - 2 >= 0
-        row_plus_1 = row + 1 < len(self._board)
-        row_plus_2 = row + 2 < len(self._board)
-        column_less_1 = column - 1 >= 0
-        column_less_2 = column - 2 >= 0
-        column_plus_1 = column + 1 < len(self._board)
-        column_plus_2 = column + 2 < len(self._board)
-
-        if self._board[row][column] == 'wk':
-            if row_plus_1 and column_plus_2 and self._board[row + 1][column + 2] == 'bh':  # right-down
-                return False
-            if row_less_1 and column_plus_2 and self._board[row - 1][column + 2] == 'bh':  # right-up
-                return False
-            if row_plus_2 and column_plus_1 and self._board[row + 2][column + 1] == 'bh':  # down-right
-                return False
-            if row_plus_2 and column_less_1 and self._board[row + 2][column - 1] == 'bh':  # down-left
-                return False
-            if row_less_2 and column_plus_1 and self._board[row - 2][column + 1] == 'bh':  # up-right
-                return False
-            if row_less_2 and column_less_1 and self._board[row - 2][column - 1] == 'bh':  # up-left
-                return False
-            if row_plus_1 and column_less_2 and self._board[row + 1][column - 2] == 'bh':  # left-down
-                return False
-            if row_less_1 and column_less_2 and self._board[row - 1][column - 2] == 'bh':  # left-up
-                return False
-
-        if self._board[row][column] == 'bk':
-            if row_plus_1 and column_plus_2 and self._board[row + 1][column + 2] == 'wh':  # right-down
-                return False
-            if row_less_1 and column_plus_2 and self._board[row - 1][column + 2] == 'wh':  # right-up
-                return False
-            if row_plus_2 and column_plus_1 and self._board[row + 2][column + 1] == 'wh':  # down-right
-                return False
-            if row_plus_2 and column_less_1 and self._board[row + 2][column - 1] == 'wh':  # down-left
-                return False
-            if row_less_2 and column_plus_1 and self._board[row - 2][column + 1] == 'wh':  # up-right
-                return False
-            if row_less_2 and column_less_1 and self._board[row - 2][column - 1] == 'wh':  # up-left
-                return False
-            if row_plus_1 and column_less_2 and self._board[row + 1][column - 2] == 'wh':  # left-down
-                return False
-            if row_less_1 and column_less_2 and self._board[row - 1][column - 2] == 'wh':  # left-up
-                return False
-        return True
-    
\ No newline at end of file
+    def king_final_check(self, position, from_square, to_square):  # position is king's position
+        """Tests if proposed move would expose king on position to check (see king_final_check_sq). If so, returns
+        False."""
+        return self.king_final_check_sq(SQUARE_INDEX[position], SQUARE_INDEX[from_square], SQUARE_INDEX[to_square])
+
+    def rook_check(self, position):  # position: of king being tested for exposure to check
+        """Testing if king on position is in check by a rook. If so, returns False."""
+        return not self._attacked_by_kind(SQUARE_INDEX[position], 'r')
+
+    def bishop_check(self, position):  # position: of king being tested for exposure to check
+        """Testing if king on position is in check by a bishop. If so, returns False."""
+        return not self._attacked_by_kind(SQUARE_INDEX[position], 'b')
+
+    def knight_check(self, position):  # position: of king being tested for exposure to check
+        """Testing if king on position is in check by a knight. If so, returns False."""
+        return not self._attacked_by_kind(SQUARE_INDEX[position], 'h')
+
+
+class Rules:
+    """Represents a board size and starting layout for ChessVar: rows by columns squares (at most 26 columns, lettered
+    from 'a', rows numbered from 1 at the bottom) and the pieces on them at the start, given as the board field of a
+    to_fen string, with one king a side and any number of rooks, bishops and knights. The rules of play are the same on
+    any board, the top row taking the place of row 8. Every table a game looks up (square names, attack tables, sliding
+    rays, Zobrist keys, shared Moves) is built once per Rules, and game_class returns a class whose methods read this
+    board's tables in place of the standard ones, so a move costs the same as on the standard board, however large the
+    board is."""
+
+    # module-level functions that read board tables, rebuilt to read this board's
+    BOARD_FUNCTIONS = ('_slider_attacks', 'rook_attacks', 'bishop_attacks')
+
+    def __init__(self, rows=ROWS, columns=COLUMNS, layout=STANDARD_LAYOUT):
+        """Creates rules for a board of rows by columns squares with the pieces of layout (e.g.
+        '10/10/10/10/10/10/10/10/RBHH2hhbr/KRBH2hbrk' for a 10x10 board). Raises ValueError if the size is out of
+        range, or layout does not fit it or has other than one king a side."""
+        if not 2 <= rows <= 99 or not 2 <= columns <= len(COLUMN_LETTERS):
+            raise ValueError('board must have 2-99 rows and 2-%d columns' % len(COLUMN_LETTERS))
+        board = _parse_board(layout, rows, columns)
+        if board.count(WK) != 1 or board.count(BK) != 1:
+            raise ValueError('layout must have exactly one king of each color')
+        self.rows = rows
+        self.columns = columns
+        self.layout = layout
+        self._starting_board = bytes(board)
+        self._tables = None
+        self._classes = {}  # engine class -> class of games on this board
+
+    def is_standard(self):
+        """Returns True if these are the standard 8x8 board and starting layout"""
+        return (self.rows, self.columns, self.layout) == (ROWS, COLUMNS, STANDARD_LAYOUT)
+
+    def tables(self):
+        """Returns dict of this board's tables, by the name of the module-level table each replaces (KING_ATTACKS,
+        SQUARES, MOVES, ...). Built on first call."""
+        if self._tables is None:
+            rows = self.rows
+            columns = self.columns
+            squares = rows * columns
+            names = tuple(name for row in _square_names(rows, columns) for name in row)
+            pieces = squares - self._starting_board.count(EMPTY)
+            packed_pieces = max(PACKED_PIECES, pieces + pieces % 2)
+            tables = {
+                'ROWS': rows, 'COLUMNS': columns, 'BOARD_SQUARES': squares,
+                'SQUARE_NAMES': _square_names(rows, columns), 'SQUARES': names,
+                'SQUARE_INDEX': MappingProxyType({name: square for square, name in enumerate(names)}),
+                'STARTING_BOARD': self._starting_board,
+                'OCCUPANCY_BYTES': (squares + 7) // 8, 'PACKED_PIECES': packed_pieces,
+                'RECORD_BYTES': (squares + 7) // 8 + packed_pieces // 2 + 1,
+                'KING_ATTACKS': _offset_table(KING_OFFSETS, rows, columns),
+                'KNIGHT_ATTACKS': _offset_table(KNIGHT_OFFSETS, rows, columns),
+                'MOVES': tuple(tuple(Move(from_sq, to_sq, names) for to_sq in range(squares))
+                               for from_sq in range(squares)),
+            }
+            tables['DIRECTION'], tables['BETWEEN'] = _line_tables(rows, columns)
+            (tables['ROOK_RAYS_UP'], tables['ROOK_RAYS_DOWN'], tables['BISHOP_RAYS_UP'], tables['BISHOP_RAYS_DOWN'],
+             tables['ROOK_LINES'], tables['BISHOP_LINES']) = _ray_tables(rows, columns)
+            (tables['ZOBRIST'], tables['ZOBRIST_BLACK_TURN'], tables['ZOBRIST_WK_AT_END'], tables['ZOBRIST_BK_AT_END'],
+             tables['ZOBRIST_GAME_STATE']) = _zobrist_keys(rows, columns)
+            namespace = dict(globals())
+            namespace.update(tables)
+            for name in self.BOARD_FUNCTIONS:
+                tables[name] = namespace[name] = _rebind(globals()[name], namespace)
+            self._tables = tables
+        return self._tables
+
+    def game_class(self, engine=None):
+        """Returns the class of games on this board for engine (ChessVar, or a subclass such as BitboardChessVar):
+        engine itself for the standard board, otherwise a subclass of it, created on first call, whose methods are
+        engine's own reading this board's tables. Its RULES attribute is this Rules. Methods wrapped by decorators
+        that set __wrapped__ (as Instrumentation's do) are copied unwrapped."""
+        engine = engine if engine is not None else ChessVar
+        if self.is_standard():
+            return engine
+        if engine not in self._classes:
+            tables = self.tables()
+            namespaces = {}  # id of a module's globals -> copy with this board's tables
+
+            def rebind(function):
+                while hasattr(function, '__wrapped__'):  # e.g. an Instrumentation wrapper: copy what it wraps
+                    function = function.__wrapped__
+                module_globals = function.__globals__
+                if id(module_globals) not in namespaces:
+                    namespace = dict(module_globals)
+                    namespace.update((name, table) for name, table in tables.items() if name in module_globals)
+                    namespaces[id(module_globals)] = namespace
+                return _rebind(function, namespaces[id(module_globals)])
+
+            attributes = {'__slots__': (), '__module__': engine.__module__, 'RULES': self}
+            for cls in reversed(engine.__mro__[:-1]):  # base classes first, so overrides replace what they override
+                for name, value in cls.__dict__.items():
+                    if isinstance(value, FunctionType):
+                        attributes[name] = rebind(value)
+                    elif isinstance(value, (classmethod, staticmethod)) and isinstance(value.__func__, FunctionType):
+                        attributes[name] = type(value)(rebind(value.__func__))
+            self._classes[engine] = type(engine.__name__, (engine,), attributes)
+        return self._classes[engine]
+
+    def new_game(self, engine=None):
+        """Returns new game on this board in the starting position, of the class game_class returns for engine"""
+        return self.game_class(engine)()
+
+    def parse_move(self, text):
+        """Returns the shared Move on this board for text such as 'a10a9'. Raises KeyError if text does not name two
+        squares of this board."""
+        match = re.fullmatch(r'([a-z][0-9]+)([a-z][0-9]+)', text)
+        if match is None:
+            raise KeyError(text)
+        square_index = self.tables()['SQUARE_INDEX']
+        return self.tables()['MOVES'][square_index[match.group(1)]][square_index[match.group(2)]]
+
+
+def _rebind(function, namespace):
+    """Returns copy of function that looks up global names in namespace rather than its module"""
+    copy = FunctionType(function.__code__, namespace, function.__name__, function.__defaults__, function.__closure__)
+    copy.__qualname__ = function.__qualname__
+    copy.__doc__ = function.__doc__
+    copy.__kwdefaults__ = function.__kwdefaults__
+    return copy
+
+
+STANDARD_RULES = Rules()
+ChessVar.RULES = STANDARD_RULES  # the standard board; classes from Rules.game_class have their own
@@ -0,0 +1,107 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: This program contains a class BitboardChessVar, an alternative engine for ChessVar that keeps its
+# position as one 64-bit integer (bitboard) per piece, using the square numbering and the precomputed king/knight
+# attack tables and sliding-ray masks from ChessVar.py. Testing whether a king is exposed to check becomes a few mask
+# operations instead of scanning the board. Users call make_move, get_game_state and get_player_turn exactly as on
+# ChessVar, with identical results.
+
+from ChessVar import ChessVar, ZOBRIST, KNIGHT_ATTACKS, ROOK_LINES, BISHOP_LINES, BOARD_SQUARES, \
+    rook_attacks, bishop_attacks, PIECE_CODES, EMPTY, WK, WR, WB, WH, BK, BR, BB, BH
+
+KIND_CODES = {'r': (WR, BR), 'b': (WB, BB), 'h': (WH, BH)}  # (white, black) piece code of each kind of piece
+
+
+class BitboardChessVar(ChessVar):
+    """Represents a modified version of a chess game, with the position kept as per-piece bitboards"""
+
+    __slots__ = ('_bitboards',)
+
+    def _index_position(self):
+        """Builds one bitboard per piece code (_bitboards[WR] for white rooks, etc.) and the occupancy bitboard from
+        _board, so attackers are found by masking rather than by reading the board. _board is still kept up to date so
+        get_board prints the same visual."""
+        self._hash = self._board_hash()
+        self._bitboards = [0] * len(PIECE_CODES)
+        self._occupied = 0
+        for square in range(BOARD_SQUARES):
+            piece = self._board[square]
+            if piece != EMPTY:
+                self._bitboards[piece] |= 1 << square
+                self._occupied |= 1 << square
+
+    def _copy_index(self, other):
+        """Copies hash and bitboards from other, a game whose _board equals this one's"""
+        self._hash = other._hash
+        self._occupied = other._occupied
+        self._bitboards = other._bitboards[:]
+
+    def _place(self, square, piece):
+        """Puts piece code piece (or EMPTY for none) on 0-63 square, on the bitboards as well as on _board, and updates
+        the Zobrist hash"""
+        old_piece = self._board[square]
+        self._hash ^= ZOBRIST[old_piece][square] ^ ZOBRIST[piece][square]
+        bit = 1 << square
+        if old_piece != EMPTY:
+            self._bitboards[old_piece] ^= bit
+        if piece != EMPTY:
+            self._bitboards[piece] |= bit
+            self._occupied |= bit
+        else:
+            self._occupied &= ~bit
+        self._board[square] = piece
+
+    def _attacked(self, square, occupied, rooks, bishops, knights):
+        """Returns True if square is attacked by any of the given rook, bishop or knight bitboards, given bitboard of
+        occupied squares"""
+        if KNIGHT_ATTACKS[square] & knights:
+            return True
+        if BISHOP_LINES[square] & bishops and bishop_attacks(square, occupied) & bishops:
+            return True
+        if ROOK_LINES[square] & rooks and rook_attacks(square, occupied) & rooks:
+            return True
+        return False
+
+    def _square_attacked(self, square, color):
+        """Returns True if any rook, bishop or knight of color ('w' or 'b') attacks 0-63 square"""
+        if color == 'w':
+            return self._attacked(square, self._occupied, self._bitboards[WR], self._bitboards[WB], self._bitboards[WH])
+        return self._attacked(square, self._occupied, self._bitboards[BR], self._bitboards[BB], self._bitboards[BH])
+
+    def king_final_check_sq(self, king_sq, from_sq, to_sq):  # king_sq is king's square after the move
+        """Tests if proposed move would expose king on king_sq to check, by computing the bitboards the move would
+        produce rather than faking the move on the board. If so, returns False."""
+        from_bit = 1 << from_sq
+        to_bit = 1 << to_sq
+        piece = self._board[from_sq]
+        if king_sq == to_sq:  # king being tested is the one moving
+            king = piece
+        else:
+            king = self._board[king_sq]
+        if king != WK and king != BK:  # matches ChessVar, where only a king on king_sq can be in check
+            return True
+
+        pieces = []
+        for code in ((BR, BB, BH) if king == WK else (WR, WB, WH)):  # enemy rooks, bishops, knights
+            bitboard = self._bitboards[code] & ~(from_bit | to_bit)  # mover leaves from_sq, piece on to_sq captured
+            if piece == code:  # enemy piece is the one moving
+                bitboard |= to_bit
+            pieces.append(bitboard)
+        occupied = (self._occupied & ~from_bit) | to_bit
+        if self._attacked(king_sq, occupied, pieces[0], pieces[1], pieces[2]):
+            return False
+        return True
+
+    def _attacked_by_kind(self, square, kind):
+        """Returns True if king on 0-63 square is attacked by an opponent's piece of the given kind ('r', 'b' or 'h'),
+        on the current board."""
+        king = self._board[square]
+        if king != WK and king != BK:
+            return False
+        attackers = self._bitboards[KIND_CODES[kind][1 if king == WK else 0]]
+        if kind == 'h':
+            return KNIGHT_ATTACKS[square] & attackers != 0
+        if kind == 'r':
+            return rook_attacks(square, self._occupied) & attackers != 0
+        return bishop_attacks(square, self._occupied) & attackers != 0
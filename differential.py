@@ -0,0 +1,399 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: Differential test of ChessVar and BitboardChessVar against reference.py, a frozen copy of the original
+# list-of-strings ChessVar. Plays random games (and the scripted games below), feeding every proposed move (legal or
+# not) to all three, and reports the first point where is_legal's or make_move's result, the board, the captured pieces,
+# the game state, the player turn or the set of legal moves differ. The reference has no move generator, so its legal
+# moves are found by trying every move of the side to move. The two engines must also agree on position_key. Games also
+# start from the FEN_POSITIONS, loaded with from_fen, which play from the start never reaches.
+# With --rules the reference is NaiveGame instead, which plays by walking the board in (row, column) coordinates with
+# none of the engines' tables, and the games are played with both engines' game_class on each board of RULES_BOARDS,
+# checking the board tables Rules builds for other board sizes.
+# Run with: python -m differential [--games N] [--seed S] [--rules]
+
+import argparse
+import random
+import re
+import string
+import sys
+
+import reference
+from ChessVar import ChessVar, Rules, SQUARES, PIECE_CODES, FEN_PIECES
+from bitboard import BitboardChessVar
+
+ENGINES = (ChessVar, BitboardChessVar)
+
+# boards played with --rules: square, small, wider than tall, and as many squares as the standard board in another shape
+RULES_BOARDS = (
+    Rules(10, 10, '10/10/10/10/10/10/10/10/RBHH2hhbr/KRBH2hbrk'),
+    Rules(6, 6, '6/6/6/6/RBH1hb/K1H1rk'),
+    Rules(12, 9, '9/9/9/9/9/9/9/9/9/9/RBHR1rhbr/KBHB1bhbk'),
+    Rules(4, 16, '16/16/16/RBH2hbrKBH2hbk'),
+)
+
+KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+KNIGHT_JUMPS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# games played move by move before the random ones, for endings random play rarely reaches
+SCRIPTED_GAMES = {
+    'tie': ['b2c3', 'g2f3', 'a1b2', 'h1g2', 'b2a3', 'g2h3', 'a3b4', 'h3h4', 'b4c5', 'h4g5', 'c5b6', 'g5h6', 'b6c7',
+            'h6h7', 'c7d8', 'h7g8'],  # white king reaches row 8, black king follows it
+}
+
+# positions random games start from as well as the starting one: a king already in check, which only a move of the
+# checking piece (or the king) can end, so the moving piece must count as gone from its square
+FEN_POSITIONS = {
+    'rook_check': 'r7/8/8/8/8/8/8/K6k b - UNFINISHED',
+    'bishop_check': 'K6k/8/8/8/8/2B5/8/8 w - UNFINISHED',
+    'knight_check': 'k7/8/8/8/8/8/2h5/K7 b - UNFINISHED',
+    'rook_check_blockable': 'K6r/8/8/8/8/8/1H6/7k b - UNFINISHED',
+}
+
+
+def _reference_state(game):
+    """Returns everything about a reference game its moves change, for _restore to put back"""
+    return ([row[:] for row in game._board], game._captured[:], game._wk_position, game._bk_position, game._wk_at_end,
+            game._bk_at_end, game._game_state, game._player_turn)
+
+
+def _restore(game, state):
+    """Puts reference game back in state, as returned by _reference_state"""
+    board, captured, wk_position, bk_position, wk_at_end, bk_at_end, game_state, player_turn = state
+    game._board = [row[:] for row in board]
+    game._captured = captured[:]
+    game._wk_position = wk_position
+    game._bk_position = bk_position
+    game._wk_at_end = wk_at_end
+    game._bk_at_end = bk_at_end
+    game._game_state = game_state
+    game._player_turn = player_turn
+
+
+def _reference_from_fen(fen):
+    """Returns reference game in the position described by fen, a string returned by ChessVar.to_fen"""
+    game = ChessVar.from_fen(fen)
+    reference_game = reference.ChessVar()
+    _restore(reference_game, ([[PIECE_CODES[code] for code in game._board[row * 8:row * 8 + 8]] for row in range(8)],
+                              game.get_captured(), SQUARES[game._wk_sq], SQUARES[game._bk_sq], game._wk_at_end,
+                              game._bk_at_end, game.get_game_state(), game.get_player_turn()))
+    return reference_game
+
+
+def _proposals(game):
+    """Returns list of every (from_square, to_square) move of a piece of the side to move in reference game, legal or
+    not"""
+    color = game.get_player_turn()[0]
+    froms = [SQUARES[row * 8 + column] for row in range(8) for column in range(8)
+             if game._board[row][column][0] == color]
+    return [(from_square, to_square) for from_square in froms for to_square in SQUARES]
+
+
+def reference_legal_moves(game):
+    """Returns set of the (from_square, to_square) moves reference game accepts, found by making each proposal and
+    undoing the ones it accepts"""
+    if game.get_game_state() != 'UNFINISHED':
+        return set()
+    state = _reference_state(game)
+    legal = set()
+    for from_square, to_square in _proposals(game):
+        if game.make_move(from_square, to_square):
+            legal.add((from_square, to_square))
+            _restore(game, state)
+    return legal
+
+
+def _compare(reference_game, games, moves):
+    """Returns None if games are in the same position as reference_game, otherwise a string describing the
+    difference"""
+    expected = ([piece for row in reference_game._board for piece in row], sorted(reference_game._captured),
+                reference_game.get_game_state(), reference_game.get_player_turn())
+    for game in games:
+        actual = ([PIECE_CODES[code] for code in game._board], sorted(game.get_captured()), game.get_game_state(),
+                  game.get_player_turn())
+        if actual != expected:
+            return '%s position differs after %s' % (type(game).__name__, moves)
+    if len({game.position_key() for game in games}) != 1:
+        return 'position_key differs after %s' % moves
+    return None
+
+
+def _compare_legal_moves(reference_game, games, moves):
+    """Returns None if generate_legal_moves of each of games gives the moves reference_game accepts, otherwise a string
+    describing the difference"""
+    expected = reference_legal_moves(reference_game)
+    for game in games:
+        if set(game.generate_legal_moves()) != expected:
+            return '%s generate_legal_moves differs after %s' % (type(game).__name__, moves)
+    return None
+
+
+def _propose(reference_game, games, from_square, to_square, moves):
+    """Proposes a move to every game, first through is_legal then make_move. Returns (accepted, failure): whether the
+    reference accepted it, and None if every game agreed, otherwise a string describing the disagreement."""
+    checks = [game.is_legal(from_square, to_square) for game in games]
+    expected = reference_game.make_move(from_square, to_square) is True
+    for game, check in zip(games, checks):
+        actual = game.make_move(from_square, to_square)
+        if check != expected or actual != expected:
+            return expected, '%s after %s: is_legal(%r, %r) returned %r and make_move %r, expected %r' % (
+                type(game).__name__, moves, from_square, to_square, check, actual, expected)
+    return expected, None
+
+
+def play_game(rng, engines=ENGINES, max_plies=200, script=None, fen=None):
+    """Plays one game on the reference and a game of each class in engines side by side, from the position described
+    by fen if given, otherwise the starting one: the moves of script (strings such as 'a2a3') if given, otherwise
+    random moves, each ply trying moves of the side to move in random order until one is accepted. Returns None if all
+    always agreed, otherwise a string describing the first disagreement."""
+    if fen is None:
+        reference_game = reference.ChessVar()
+        games = [engine() for engine in engines]
+    else:
+        reference_game = _reference_from_fen(fen)
+        games = [engine.from_fen(fen) for engine in engines]
+    moves = []
+    for ply in range(len(script) if script is not None else max_plies):
+        if reference_game.get_game_state() != 'UNFINISHED':
+            break
+        failure = _compare_legal_moves(reference_game, games, moves)
+        if failure is not None:
+            return failure
+        if script is not None:
+            proposals = [(script[ply][:2], script[ply][2:])]
+        else:
+            proposals = _proposals(reference_game)
+            rng.shuffle(proposals)
+        accepted = False
+        for from_square, to_square in proposals:
+            accepted, failure = _propose(reference_game, games, from_square, to_square, moves)
+            if failure is not None:
+                return failure
+            if accepted:
+                moves.append(from_square + to_square)
+                failure = _compare(reference_game, games, moves)
+                if failure is not None:
+                    return failure
+                break
+        if accepted is False and script is not None:
+            return 'scripted move %s rejected after %s' % (script[ply], moves)
+        if accepted is False:  # side to move has no legal move
+            break
+    failure = _compare_legal_moves(reference_game, games, moves)
+    if failure is not None:
+        return failure
+    return _compare(reference_game, games, moves)
+
+
+def run(games=100, seed=0, engines=ENGINES):
+    """Plays the scripted games, a random game from each of FEN_POSITIONS and the given number of random games,
+    returning list of disagreement descriptions (empty if none)"""
+    rng = random.Random(seed)
+    failures = []
+    for script in SCRIPTED_GAMES.values():
+        failure = play_game(rng, engines, script=script)
+        if failure is not None:
+            failures.append(failure)
+    for name, fen in FEN_POSITIONS.items():
+        failure = play_game(rng, engines, fen=fen)
+        if failure is not None:
+            failures.append('%s: %s' % (name, failure))
+    for _ in range(games):
+        failure = play_game(rng, engines)
+        if failure is not None:
+            failures.append(failure)
+    return failures
+
+
+class NaiveGame:
+    """Represents a game on the board of a Rules, played by walking the board in (row, column) coordinates (row 0 the
+    top row) with none of the engines' tables, square numbers or bitboards: slow, but simple enough to check by eye.
+    Pieces are piece strings such as 'wk', '  ' for an empty square."""
+
+    def __init__(self, rules):
+        """Creates game in the starting position of rules, parsed from its layout"""
+        self.rows = rules.rows
+        self.columns = rules.columns
+        self.board = [[piece for token in re.findall(r'[0-9]+|[A-Za-z]', row_text)
+                       for piece in (['  '] * int(token) if token.isdigit() else [FEN_PIECES[token]])]
+                      for row_text in rules.layout.split('/')]
+        self.captured = []
+        self.player_turn = 'white'
+        self.wk_at_end = False
+        self.game_state = 'UNFINISHED'
+
+    def _name(self, row, column):
+        """Returns algebraic name of square (row, column), e.g. 'a10' for the top left square of a 10x10 board"""
+        return string.ascii_lowercase[column] + str(self.rows - row)
+
+    def _coordinates(self, square):
+        """Returns (row, column) of square named such as 'a10'"""
+        return self.rows - int(square[1:]), string.ascii_lowercase.index(square[0])
+
+    def piece(self, square):
+        """Returns piece string of the piece on square named such as 'a10', '  ' if there is none"""
+        row, column = self._coordinates(square)
+        return self.board[row][column]
+
+    def _targets(self, board, row, column):
+        """Returns list of (row, column) squares the piece on (row, column) of board attacks"""
+        kind = board[row][column][1]
+        if kind in 'kh':
+            return [(row + row_step, column + column_step)
+                    for row_step, column_step in (KING_STEPS if kind == 'k' else KNIGHT_JUMPS)
+                    if 0 <= row + row_step < self.rows and 0 <= column + column_step < self.columns]
+        targets = []
+        for row_step, column_step in ROOK_DIRECTIONS if kind == 'r' else BISHOP_DIRECTIONS:
+            target_row, target_column = row + row_step, column + column_step
+            while 0 <= target_row < self.rows and 0 <= target_column < self.columns:
+                targets.append((target_row, target_column))
+                if board[target_row][target_column] != '  ':
+                    break
+                target_row, target_column = target_row + row_step, target_column + column_step
+        return targets
+
+    def _safe(self, board):
+        """Returns True if the kings on board are not next to each other and no piece attacks the other side's king"""
+        kings = {board[row][column]: (row, column) for row in range(self.rows) for column in range(self.columns)
+                 if board[row][column][1] == 'k'}
+        (white_row, white_column), (black_row, black_column) = kings['wk'], kings['bk']
+        if abs(white_row - black_row) <= 1 and abs(white_column - black_column) <= 1:
+            return False
+        for row in range(self.rows):
+            for column in range(self.columns):
+                piece = board[row][column]
+                if piece[1] in 'rbh' and kings['bk' if piece[0] == 'w' else 'wk'] in self._targets(board, row, column):
+                    return False
+        return True
+
+    def legal_moves(self):
+        """Returns set of the (from_square, to_square) moves the player to move may make: a move to a square the piece
+        attacks, not onto a piece of its own or a king, leaving neither king attacked"""
+        if self.game_state != 'UNFINISHED':
+            return set()
+        color = self.player_turn[0]
+        legal = set()
+        for row in range(self.rows):
+            for column in range(self.columns):
+                if self.board[row][column][0] != color:
+                    continue
+                for target_row, target_column in self._targets(self.board, row, column):
+                    target = self.board[target_row][target_column]
+                    if target[0] == color or target[1] == 'k':
+                        continue
+                    board = [board_row[:] for board_row in self.board]
+                    board[target_row][target_column], board[row][column] = board[row][column], '  '
+                    if self._safe(board):
+                        legal.add((self._name(row, column), self._name(target_row, target_column)))
+        return legal
+
+    def make_move(self, from_square, to_square):
+        """Makes legal move from_square to to_square, then ends the game or passes the turn: a white king reaching the
+        top row gives black one reply, a tie if it brings the black king to the top row too and a white win otherwise;
+        a black king reaching the top row first wins"""
+        (from_row, from_column), (to_row, to_column) = self._coordinates(from_square), self._coordinates(to_square)
+        piece = self.board[from_row][from_column]
+        if self.board[to_row][to_column] != '  ':
+            self.captured.append(self.board[to_row][to_column])
+        self.board[to_row][to_column], self.board[from_row][from_column] = piece, '  '
+        if piece == 'wk' and to_row == 0:
+            self.wk_at_end = True
+        elif self.wk_at_end:
+            self.game_state = 'TIE' if piece == 'bk' and to_row == 0 else 'WHITE_WON'
+            return
+        elif piece == 'bk' and to_row == 0:
+            self.game_state = 'BLACK_WON'
+            return
+        self.player_turn = 'black' if self.player_turn == 'white' else 'white'
+
+
+def _compare_naive(naive_game, games, moves):
+    """Returns None if games are in the same position as naive_game, with the same legal moves, otherwise a string
+    describing the difference"""
+    expected = ([piece for row in naive_game.board for piece in row], sorted(naive_game.captured),
+                naive_game.game_state, naive_game.player_turn)
+    legal = naive_game.legal_moves()
+    for game in games:
+        actual = ([PIECE_CODES[code] for code in game._board], sorted(game.get_captured()), game.get_game_state(),
+                  game.get_player_turn())
+        if actual != expected:
+            return '%s position differs after %s' % (type(game).__name__, moves)
+        if set(game.generate_legal_moves()) != legal:
+            return '%s generate_legal_moves differs after %s' % (type(game).__name__, moves)
+    if len({game.position_key() for game in games}) != 1:
+        return 'position_key differs after %s' % moves
+    return None
+
+
+def play_rules_game(rng, rules, engines=ENGINES, max_plies=200):
+    """Plays one random game on the board of rules on a NaiveGame and a game of each engine's game_class side by side,
+    each ply proposing moves of the side to move in random order (through is_legal, then make_move) until one is
+    legal. Returns None if all always agreed, otherwise a string describing the first disagreement."""
+    naive_game = NaiveGame(rules)
+    games = [rules.new_game(engine) for engine in engines]
+    squares = [naive_game._name(row, column) for row in range(rules.rows) for column in range(rules.columns)]
+    moves = []
+    for _ in range(max_plies):
+        failure = _compare_naive(naive_game, games, moves)
+        if failure is not None or naive_game.game_state != 'UNFINISHED':
+            return failure
+        legal = naive_game.legal_moves()
+        if not legal:  # side to move has no legal move
+            return None
+        color = naive_game.player_turn[0]
+        proposals = [(from_square, to_square) for from_square in squares if naive_game.piece(from_square)[0] == color
+                     for to_square in squares]
+        rng.shuffle(proposals)
+        for from_square, to_square in proposals:
+            expected = (from_square, to_square) in legal
+            for game in games:
+                check = game.is_legal(from_square, to_square)
+                actual = game.make_move(from_square, to_square)
+                if check != expected or actual != expected:
+                    return '%s on %dx%d after %s: is_legal(%r, %r) returned %r and make_move %r, expected %r' % (
+                        type(game).__name__, rules.rows, rules.columns, moves, from_square, to_square, check, actual,
+                        expected)
+            if expected:
+                naive_game.make_move(from_square, to_square)
+                moves.append(from_square + to_square)
+                break
+    return _compare_naive(naive_game, games, moves)
+
+
+def run_rules(games=10, seed=0, engines=ENGINES, boards=RULES_BOARDS):
+    """Plays the given number of random games on each Rules of boards, returning list of disagreement descriptions
+    (empty if none)"""
+    rng = random.Random(seed)
+    failures = []
+    for rules in boards:
+        for _ in range(games):
+            failure = play_rules_game(rng, rules, engines)
+            if failure is not None:
+                failures.append(failure)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Differential test of ChessVar and BitboardChessVar against the '
+                                                 'original ChessVar')
+    parser.add_argument('--games', type=int, default=100, help='number of random games to play')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--rules', action='store_true',
+                        help='play GAMES games on each board of RULES_BOARDS against NaiveGame instead')
+    args = parser.parse_args(argv)
+    if args.rules:
+        failures = run_rules(args.games, args.seed)
+        total = args.games * len(RULES_BOARDS)
+    else:
+        failures = run(args.games, args.seed)
+        total = args.games + len(SCRIPTED_GAMES) + len(FEN_POSITIONS)
+    for failure in failures:
+        print(failure)
+    print('%d/%d games agreed' % (total - len(failures), total))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
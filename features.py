@@ -0,0 +1,293 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: Vectorized feature extraction for batches of ChessVar positions, for training pipelines that score
+# millions of them. pack_boards stacks the boards of N games (and unpack_records the 24-byte records written by
+# to_bytes) into an (N, 64) array of piece codes, piece_planes turns that into an (N, 8, 64) plane tensor, and
+# batch_features computes rook, bishop, knight and king attack maps for the whole batch at once with bitboard shifts
+# and masks on uint64 arrays, returning one array per feature. Requires NumPy, which the rest of the package does not:
+# this module imports without it, but its functions raise ImportError. verify checks unpack_records and every feature
+# against values worked out square by square from ChessVar's own attack tables.
+# Run with: python -m features [--positions N] (benchmark) | python -m features --verify [--positions N]
+
+import argparse
+import json
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # only needed by this module
+    np = None
+
+from ChessVar import (ChessVar, PIECE_CODES, PIECE_COLOR, PIECE_KIND, STARTING_BOARD, WK, BK, KING_ATTACKS,
+                      KNIGHT_ATTACKS, rook_attacks, bishop_attacks)
+
+if np is not None:
+    _U64 = np.uint64
+    ALL = _U64(0xFFFFFFFFFFFFFFFF)
+    NOT_FILE_A = _U64(0xFEFEFEFEFEFEFEFE)  # column 0 is bit 0 of each row's byte, as square n is bit n
+    NOT_FILE_H = _U64(0x7F7F7F7F7F7F7F7F)
+    NOT_FILE_AB = _U64(0xFCFCFCFCFCFCFCFC)
+    NOT_FILE_GH = _U64(0x3F3F3F3F3F3F3F3F)
+    # (square number change, mask of squares a shifted bit may land on without wrapping to another row)
+    ROOK_SHIFTS = ((8, ALL), (-8, ALL), (1, NOT_FILE_A), (-1, NOT_FILE_H))
+    BISHOP_SHIFTS = ((9, NOT_FILE_A), (7, NOT_FILE_H), (-7, NOT_FILE_A), (-9, NOT_FILE_H))
+    KING_SHIFTS = ROOK_SHIFTS + BISHOP_SHIFTS
+    KNIGHT_SHIFTS = ((17, NOT_FILE_A), (15, NOT_FILE_H), (10, NOT_FILE_AB), (6, NOT_FILE_GH),
+                     (-6, NOT_FILE_AB), (-10, NOT_FILE_GH), (-15, NOT_FILE_A), (-17, NOT_FILE_H))
+
+
+def _require_numpy():
+    """Raises ImportError if NumPy is not installed"""
+    if np is None:
+        raise ImportError('features.py requires NumPy (pip install numpy)')
+
+
+def pack_boards(games):
+    """Returns (N, 64) uint8 array of the piece codes (indexes into PIECE_CODES) on every square of each of the N
+    games in games, square n being row * 8 + column as in ChessVar. Raises ValueError for games not on the standard
+    8x8 board."""
+    _require_numpy()
+    games = list(games)
+    if any((game.RULES.rows, game.RULES.columns) != (8, 8) for game in games):
+        raise ValueError('batch features need games on the standard 8x8 board')
+    return np.frombuffer(b''.join(bytes(game._board) for game in games), dtype=np.uint8).reshape(-1, 64)
+
+
+def unpack_records(data):
+    """Returns (codes, flags) for data, N 24-byte positions written by ChessVar.to_bytes and joined together: codes is
+    the (N, 64) uint8 array of piece codes on every square, flags the (N,) uint8 array of each record's flags byte"""
+    _require_numpy()
+    records = np.frombuffer(bytes(data), dtype=np.uint8).reshape(-1, 24)
+    occupied = np.unpackbits(records[:, 7::-1], axis=1, bitorder='little').astype(bool)  # (N, 64), bit n = square n
+    nibbles = np.empty((len(records), 30), dtype=np.uint8)
+    nibbles[:, 0::2] = records[:, 8:23] >> 4
+    nibbles[:, 1::2] = records[:, 8:23] & 15
+    index = np.cumsum(occupied, axis=1) - 1  # position of each occupied square's code among the nibbles
+    codes = np.take_along_axis(nibbles, np.clip(index, 0, 29), axis=1)
+    codes[~occupied] = 0
+    return codes, records[:, 23].copy()
+
+
+def piece_planes(codes):
+    """Returns (N, 8, 64) uint8 tensor with plane p set to 1 on the squares holding piece code p + 1 (PIECE_CODES[1:],
+    white king first), from (N, 64) array of piece codes. Reshape to (N, 8, 8, 8) for rows and columns."""
+    _require_numpy()
+    codes = np.asarray(codes, dtype=np.uint8)
+    return (codes[:, None, :] == np.arange(1, len(PIECE_CODES), dtype=np.uint8)[None, :, None]).astype(np.uint8)
+
+
+def _bitboards(codes):
+    """Returns (N, 8) uint64 array of one bitboard per piece code 1-8 from (N, 64) array of piece codes"""
+    planes = piece_planes(codes)
+    return np.packbits(planes, axis=2, bitorder='little').view('<u8').reshape(len(planes), -1).astype(_U64)
+
+
+def _shift(bitboards, shift, mask):
+    """Returns bitboards with every bit moved by shift squares (positive toward square 63), dropping bits that leave
+    the board or land outside mask"""
+    if shift > 0:
+        return (bitboards << _U64(shift)) & mask
+    return (bitboards >> _U64(-shift)) & mask
+
+
+def _slide(pieces, empty, shift, mask):
+    """Returns bitboards of squares attacked along one direction by sliding pieces, stopping at (and including) the
+    first occupied square: a Kogge-Stone fill, doubling the distance covered at each step"""
+    empty = empty & mask
+    pieces = pieces | (empty & _shift(pieces, shift, ALL))
+    empty = empty & _shift(empty, shift, ALL)
+    pieces = pieces | (empty & _shift(pieces, 2 * shift, ALL))
+    empty = empty & _shift(empty, 2 * shift, ALL)
+    pieces = pieces | (empty & _shift(pieces, 4 * shift, ALL))
+    return _shift(pieces, shift, mask)
+
+
+def _attacks(pieces, kind, empty):
+    """Returns bitboards of squares attacked by pieces of kind ('k', 'r', 'b' or 'h'), given bitboards of empty
+    squares"""
+    attacks = np.zeros_like(pieces)
+    if kind == 'r' or kind == 'b':
+        for shift, mask in (ROOK_SHIFTS if kind == 'r' else BISHOP_SHIFTS):
+            attacks |= _slide(pieces, empty, shift, mask)
+    else:
+        for shift, mask in (KING_SHIFTS if kind == 'k' else KNIGHT_SHIFTS):
+            attacks |= _shift(pieces, shift, mask)
+    return attacks
+
+
+def _popcount(bitboards):
+    """Returns number of bits set in each uint64 of bitboards"""
+    if hasattr(np, 'bitwise_count'):  # NumPy 2.0 and later
+        return np.bitwise_count(bitboards).astype(np.int16)
+    table = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.int16)
+    return table[np.ascontiguousarray(bitboards).view(np.uint8).reshape(bitboards.shape + (8,))].sum(axis=-1)
+
+
+def batch_features(positions):
+    """Returns dict of feature arrays for a batch of N positions, given either as a list of games or as an (N, 64)
+    array of piece codes (see pack_boards and unpack_records). Arrays over the piece codes 1-8 are ordered as
+    PIECE_CODES[1:], white king first; arrays over the two colors are white first. Mobility counts the squares each
+    piece could move to by its movement rules alone (empty, or holding an opponent's piece other than the king),
+    without testing whether the move would expose a king to check.
+        'king_distance': (N, 2) rows each king has left to reach row 8
+        'attacks': (N, 8) uint64 bitboards of squares attacked by the pieces of each code
+        'mobility': (N, 8) total squares the pieces of each code could move to
+        'king_zone_attacks': (N, 2) squares on or next to each king attacked by opponent rooks, bishops, knights
+        'king_path_attacks': (N, 2) squares in the row ahead of each king (its way to row 8) attacked likewise"""
+    _require_numpy()
+    codes = positions if isinstance(positions, np.ndarray) else pack_boards(positions)
+    boards = _bitboards(codes)
+    white = boards[:, 0] | boards[:, 1] | boards[:, 2] | boards[:, 3]
+    black = boards[:, 4] | boards[:, 5] | boards[:, 6] | boards[:, 7]
+    empty = ~(white | black)
+
+    attacks = np.zeros_like(boards)
+    mobility = np.zeros(boards.shape, dtype=np.int16)
+    for index, piece in enumerate(PIECE_CODES[1:]):
+        own, enemy_king = (white, boards[:, 4]) if piece[0] == 'w' else (black, boards[:, 0])
+        allowed = ~(own | enemy_king)
+        remaining = boards[:, index].copy()
+        while remaining.any():  # one piece of this code per position at a time, so each piece's moves are counted
+            piece_bits = remaining & (~remaining + _U64(1))  # lowest set bit
+            remaining ^= piece_bits
+            piece_attacks = _attacks(piece_bits, piece[1], empty)
+            attacks[:, index] |= piece_attacks
+            mobility[:, index] += _popcount(piece_attacks & allowed)
+
+    white_attacks = attacks[:, 1] | attacks[:, 2] | attacks[:, 3]  # rooks, bishops and knights; kings can't check
+    black_attacks = attacks[:, 5] | attacks[:, 6] | attacks[:, 7]
+    kings = boards[:, (0, 4)]
+    king_zones = kings | attacks[:, (0, 4)]
+    king_paths = _shift(kings, -8, ALL) | _shift(kings, -7, NOT_FILE_A) | _shift(kings, -9, NOT_FILE_H)
+    enemy_attacks = np.stack((black_attacks, white_attacks), axis=1)
+    return {
+        'king_distance': (_popcount(kings - _U64(1)) // 8).astype(np.int8),  # square of a lone bit is bits below it
+        'attacks': attacks,
+        'mobility': mobility,
+        'king_zone_attacks': _popcount(king_zones & enemy_attacks),
+        'king_path_attacks': _popcount(king_paths & enemy_attacks),
+    }
+
+
+def _sample_games(count, seed=0):
+    """Returns list of count games, each in the position after a random number of random legal moves"""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = ChessVar()
+        for _ in range(rng.randrange(40)):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            game.play(rng.choice(moves))
+        games.append(game)
+    return games
+
+
+def _placed_games(count, seed=0):
+    """Returns list of count games, each with a random subset of the starting pieces (always both kings) on random
+    squares, white to move: positions random play rarely reaches, with pieces on every edge and corner"""
+    rng = random.Random(seed)
+    pieces = [code for code in STARTING_BOARD if code and code != WK and code != BK]
+    games = []
+    for _ in range(count):
+        codes = [WK, BK] + rng.sample(pieces, rng.randrange(len(pieces) + 1))
+        board = bytearray(64)
+        for code, square in zip(codes, rng.sample(range(64), len(codes))):
+            board[square] = code
+        game = ChessVar.__new__(ChessVar)
+        game._load_position(board, 'white', False, False, 'UNFINISHED')
+        games.append(game)
+    return games
+
+
+def _expected_features(game):
+    """Returns dict of the features batch_features should give for game, as lists, worked out square by square with
+    ChessVar's attack tables"""
+    board = game._board
+    occupied = game._occupied
+    attacks = [0] * 8
+    mobility = [0] * 8
+    for square, code in enumerate(board):
+        if code == 0:
+            continue
+        kind = PIECE_KIND[code]
+        if kind == 'k':
+            targets = KING_ATTACKS[square]
+        elif kind == 'h':
+            targets = KNIGHT_ATTACKS[square]
+        elif kind == 'r':
+            targets = rook_attacks(square, occupied)
+        else:
+            targets = bishop_attacks(square, occupied)
+        attacks[code - 1] |= targets
+        blocked = [other for other, other_code in enumerate(board)
+                   if other_code and (PIECE_COLOR[other_code] == PIECE_COLOR[code] or PIECE_KIND[other_code] == 'k')]
+        mobility[code - 1] += bin(targets & ~sum(1 << other for other in blocked)).count('1')
+    enemy_attacks = (attacks[5] | attacks[6] | attacks[7], attacks[1] | attacks[2] | attacks[3])
+    zone_attacks = []
+    path_attacks = []
+    for king_sq, enemy in zip((game._wk_sq, game._bk_sq), enemy_attacks):
+        row, column = divmod(king_sq, 8)
+        zone_attacks.append(bin(((1 << king_sq) | KING_ATTACKS[king_sq]) & enemy).count('1'))
+        path = sum(1 << ((row - 1) * 8 + path_column) for path_column in (column - 1, column, column + 1)
+                   if row > 0 and 0 <= path_column < 8)
+        path_attacks.append(bin(path & enemy).count('1'))
+    return {'king_distance': [game._wk_sq // 8, game._bk_sq // 8], 'attacks': attacks, 'mobility': mobility,
+            'king_zone_attacks': zone_attacks, 'king_path_attacks': path_attacks}
+
+
+def verify(positions=2000, seed=0):
+    """Checks batch_features and unpack_records against ChessVar on positions positions, half reached by random play
+    and half with pieces placed at random: every feature must match the one worked out square by square from
+    ChessVar's attack tables, and unpacking each position's to_bytes record must give back its board and flags.
+    Returns dict of the number of positions checked and a list of 'feature: to_fen' strings for each mismatch."""
+    _require_numpy()
+    games = _sample_games(positions - positions // 2, seed) + _placed_games(positions // 2, seed)
+    features = batch_features(games)
+    codes, flags = unpack_records(b''.join(game.to_bytes() for game in games))
+    packed = pack_boards(games)
+    mismatches = []
+    for index, game in enumerate(games):
+        for name, values in _expected_features(game).items():
+            if [int(value) for value in features[name][index]] != values:
+                mismatches.append('%s: %s' % (name, game.to_fen()))
+        if not (codes[index] == packed[index]).all() or flags[index] != game.to_bytes()[-1]:
+            mismatches.append('unpack_records: %s' % game.to_fen())
+    return {'positions': len(games), 'mismatches': mismatches}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark vectorized ChessVar feature extraction, or check it '
+                                                 'against ChessVar with --verify')
+    parser.add_argument('--positions', type=int, default=None,
+                        help='positions per batch (default 100000), or positions to check with --verify (default 2000)')
+    parser.add_argument('--verify', action='store_true', help='check the features against ChessVar')
+    args = parser.parse_args(argv)
+    _require_numpy()
+    if args.verify:
+        report = verify(args.positions if args.positions is not None else 2000)
+        print(json.dumps(report))
+        return 1 if report['mismatches'] else 0
+    args.positions = args.positions if args.positions is not None else 100000
+
+    sample = _sample_games(1000)
+    codes = np.tile(pack_boards(sample), ((args.positions + 999) // 1000, 1))[:args.positions]
+    records = b''.join(game.to_bytes() for game in sample) * ((args.positions + 999) // 1000)
+    start = time.perf_counter()
+    unpack_records(records[:24 * args.positions])
+    unpack_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_features(codes)
+    feature_seconds = time.perf_counter() - start
+    print(json.dumps({'positions': args.positions,
+                      'unpack_records_per_second': round(args.positions / unpack_seconds),
+                      'features_per_second': round(args.positions / feature_seconds)}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: This program contains a class Instrumentation, opt-in counters for the stages of making a move: how many
+# times each stage ran and a histogram of how long it took, plus why rejected moves were rejected (wrong turn, own
+# piece, path blocked, exposes check, ...), exported as a dict or as Prometheus text. While enabled it replaces the
+# stage methods of ChessVar and BitboardChessVar (and of the classes Rules.game_class made from them) with timed
+# wrappers; disabling puts the original methods back, so
+# instrumentation that is switched off costs nothing at all.
+# Run with: python -m instrumentation [--games N] [--format json|prometheus]
+
+import argparse
+import functools
+import json
+import random
+import sys
+import time
+
+from ChessVar import ChessVar, PIECE_COLOR, PIECE_KIND, KING_ATTACKS, KNIGHT_ATTACKS, DIRECTION, BETWEEN, WK, BK
+from bitboard import BitboardChessVar
+
+# method name -> stage name, in the order they run when a move is made: make_move_sq calls is_legal_sq, which calls
+# the moving piece's rules, which call king_final_check_sq; then the move is applied
+STAGES = {
+    'make_move_sq': 'make_move',
+    'is_legal_sq': 'validate',
+    '_king_move_legal': 'king_rules',
+    '_rook_move_legal': 'rook_rules',
+    '_bishop_move_legal': 'bishop_rules',
+    '_knight_move_legal': 'knight_rules',
+    'king_final_check_sq': 'king_final_check',
+    '_record_king_move': 'apply_king_move',
+    '_record_move': 'apply_move',
+}
+REJECTION_REASONS = ('wrong_turn', 'game_over', 'own_piece', 'king_capture', 'bad_shape', 'path_blocked',
+                     'kings_adjacent', 'exposes_check')
+HISTOGRAM_BUCKETS = 32  # bucket b counts durations of under 2 ** b nanoseconds (and at least 2 ** (b - 1))
+
+
+def _line_tables(game):
+    """Returns (KING_ATTACKS, KNIGHT_ATTACKS, DIRECTION, BETWEEN) of the board game is played on"""
+    if game.RULES.is_standard():
+        return KING_ATTACKS, KNIGHT_ATTACKS, DIRECTION, BETWEEN
+    tables = game.RULES.tables()
+    return tables['KING_ATTACKS'], tables['KNIGHT_ATTACKS'], tables['DIRECTION'], tables['BETWEEN']
+
+
+def rejection_reason(game, from_sq, to_sq):
+    """Returns why is_legal_sq (and so make_move_sq) rejects the move from square from_sq to to_sq in game (one of
+    REJECTION_REASONS), by making the same tests in the same order on game's board. Only meaningful for a move
+    is_legal_sq rejects."""
+    king_attacks, knight_attacks, direction_table, between = _line_tables(game)
+    piece = game._board[from_sq]
+    target = game._board[to_sq]
+    color = game._player_turn[0]
+    if PIECE_COLOR[piece] != color:
+        return 'wrong_turn'
+    if game._game_state != 'UNFINISHED':
+        return 'game_over'
+    if PIECE_COLOR[target] == color:
+        return 'own_piece'
+    if target == WK or target == BK:
+        return 'king_capture'
+    kind = PIECE_KIND[piece]
+    if kind == 'k':
+        if not king_attacks[from_sq] >> to_sq & 1:
+            return 'bad_shape'
+        other_king_sq = game._bk_sq if color == 'w' else game._wk_sq
+        if game.king_check_sq(other_king_sq, from_sq, to_sq) is False:
+            return 'kings_adjacent'
+        return 'exposes_check'
+    if kind == 'h':
+        return 'exposes_check' if knight_attacks[from_sq] >> to_sq & 1 else 'bad_shape'
+    direction = direction_table[from_sq][to_sq]
+    if direction == -1 or (direction < 4) != (kind == 'r'):
+        return 'bad_shape'
+    if between[from_sq][to_sq] & game._occupied:
+        return 'path_blocked'
+    return 'exposes_check'
+
+
+class Instrumentation:
+    """Represents a set of counters for the stages of making a move in games of the given classes: calls and a
+    timing histogram per stage (times are inclusive, so validate includes king_final_check), and a count per reason
+    make_move rejected a move (is_legal queries, which make no move, are not counted). Only one Instrumentation may
+    be enabled at a time. Can be used as a context manager that enables it on entry and disables it on exit."""
+
+    _active = None  # the enabled Instrumentation, if any
+
+    def __init__(self, classes=(ChessVar, BitboardChessVar)):
+        """Creates disabled, zeroed counters for games of classes"""
+        self._classes = classes
+        self._originals = []  # (class, method name, original function) of every method replaced while enabled
+        self._calls = dict.fromkeys(STAGES.values(), 0)
+        self._total_ns = dict.fromkeys(STAGES.values(), 0)
+        self._histograms = {stage: [0] * HISTOGRAM_BUCKETS for stage in STAGES.values()}
+        self._rejections = dict.fromkeys(REJECTION_REASONS, 0)
+
+    def reset(self):
+        """Sets every counter back to zero. The counters are cleared in place, as enabled wrappers hold on to them."""
+        for counts in (self._calls, self._total_ns, self._rejections):
+            for name in counts:
+                counts[name] = 0
+        for histogram in self._histograms.values():
+            histogram[:] = [0] * HISTOGRAM_BUCKETS
+
+    def is_enabled(self):
+        """Returns True if the stage methods are currently instrumented by this Instrumentation"""
+        return Instrumentation._active is self
+
+    def enable(self):
+        """Replaces each stage method of each class, and of each class Rules.game_class has made from one, with a
+        timed wrapper. Only methods a class defines itself are replaced, as inherited ones are wrapped on the class
+        they come from. Classes game_class makes while enabled are instrumented from the next enable. Raises
+        RuntimeError if an Instrumentation is already enabled."""
+        if Instrumentation._active is not None:
+            raise RuntimeError('another Instrumentation is already enabled')
+        Instrumentation._active = self
+        classes = list(self._classes)
+        # game_class subclasses copy every method with their own RULES, so each needs wrappers of its own
+        classes.extend(subclass for cls in self._classes for subclass in cls.__subclasses__()
+                       if 'RULES' in subclass.__dict__ and subclass not in classes)
+        for cls in classes:
+            for name, stage in STAGES.items():
+                if name in cls.__dict__:
+                    original = cls.__dict__[name]
+                    self._originals.append((cls, name, original))
+                    # reasons are counted for moves make_move_sq rejects, not for is_legal screening queries
+                    setattr(cls, name, self._wrap(stage, original, name == 'make_move_sq'))
+
+    def disable(self):
+        """Puts back the original stage methods, leaving the counters as they are"""
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals = []
+        if Instrumentation._active is self:
+            Instrumentation._active = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def _wrap(self, stage, method, count_rejections):
+        """Returns method wrapped to count and time its calls under stage, and if count_rejections, to count the
+        reason for each move it rejects"""
+        calls = self._calls
+        total_ns = self._total_ns
+        histogram = self._histograms[stage]
+        rejections = self._rejections
+        clock = time.perf_counter_ns
+
+        @functools.wraps(method)
+        def timed(game, *args):
+            start = clock()
+            result = method(game, *args)
+            elapsed = clock() - start
+            calls[stage] += 1
+            total_ns[stage] += elapsed
+            histogram[min(elapsed.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+            if count_rejections and result is False:
+                rejections[rejection_reason(game, *args)] += 1
+            return result
+        return timed
+
+    def as_dict(self):
+        """Returns dict of the counters: for each stage its calls, total and mean nanoseconds, and histogram (upper
+        bound in nanoseconds -> calls taking less than it and at least the previous bound), and rejections by reason"""
+        stages = {}
+        for stage, calls in self._calls.items():
+            stages[stage] = {'calls': calls, 'total_ns': self._total_ns[stage],
+                             'mean_ns': round(self._total_ns[stage] / calls) if calls else 0,
+                             'histogram_ns': {2 ** bucket: count for bucket, count in enumerate(self._histograms[stage])
+                                              if count}}
+        return {'stages': stages, 'rejections': dict(self._rejections)}
+
+    def to_prometheus(self, prefix='chessvar'):
+        """Returns the counters in the Prometheus text exposition format: a histogram of stage durations in seconds
+        labelled by stage, and a counter of rejected moves labelled by reason"""
+        lines = ['# HELP %s_stage_seconds Time spent in each stage of making a move.' % prefix,
+                 '# TYPE %s_stage_seconds histogram' % prefix]
+        for stage, calls in self._calls.items():
+            cumulative = 0
+            for bucket, count in enumerate(self._histograms[stage]):
+                cumulative += count
+                lines.append('%s_stage_seconds_bucket{stage="%s",le="%.9g"} %d' % (prefix, stage, 2 ** bucket / 1e9,
+                                                                                 cumulative))
+            lines.append('%s_stage_seconds_bucket{stage="%s",le="+Inf"} %d' % (prefix, stage, calls))
+            lines.append('%s_stage_seconds_sum{stage="%s"} %.9f' % (prefix, stage, self._total_ns[stage] / 1e9))
+            lines.append('%s_stage_seconds_count{stage="%s"} %d' % (prefix, stage, calls))
+        lines.append('# HELP %s_rejections_total Moves rejected, by reason.' % prefix)
+        lines.append('# TYPE %s_rejections_total counter' % prefix)
+        for reason, count in self._rejections.items():
+            lines.append('%s_rejections_total{reason="%s"} %d' % (prefix, reason, count))
+        return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play random games with move-making instrumentation enabled')
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--engine', choices=('ChessVar', 'BitboardChessVar'), default='ChessVar')
+    parser.add_argument('--format', choices=('json', 'prometheus'), default='json')
+    args = parser.parse_args(argv)
+
+    engine = BitboardChessVar if args.engine == 'BitboardChessVar' else ChessVar
+    rng = random.Random(0)
+    game = engine()
+    with Instrumentation() as instrumentation:
+        for _ in range(args.games):
+            game.reset()
+            while game.get_game_state() == 'UNFINISHED':
+                # a few random moves of random pieces, most of them rejected, then a legal one
+                for _ in range(4):
+                    game.make_move_sq(rng.choice([sq for sq in range(64) if game._board[sq]]), rng.randrange(64))
+                moves = game.legal_moves()
+                if not moves or game.get_game_state() != 'UNFINISHED':
+                    break
+                game.play(rng.choice(moves))
+    if args.format == 'prometheus':
+        sys.stdout.write(instrumentation.to_prometheus())
+    else:
+        print(json.dumps(instrumentation.as_dict(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
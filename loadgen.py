@@ -0,0 +1,140 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: Load generator for server.py. Opens a number of connections to a running GameServer (or starts one in a
+# subprocess with --spawn), and on each connection plays many games at once, sending one move for every game in a
+# batch and then reading the batch's responses, so requests are pipelined. Moves come from random legal games played
+# locally beforehand, so the server accepts every one. Prints moves per second and round-trip times as JSON.
+# Run with: python -m loadgen --spawn [--connections C] [--games G] [--seconds S]
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from ChessVar import ChessVar
+
+
+def random_games(count, max_plies=200, seed=0):
+    """Returns list of count move lists ('a2a3' strings), each a random legal game from the starting position"""
+    rng = random.Random(seed)
+    games = []
+    game = ChessVar()
+    for _ in range(count):
+        game.reset()
+        moves = []
+        while len(moves) < max_plies and game.get_game_state() == 'UNFINISHED':
+            legal = game.legal_moves()
+            if not legal:
+                break
+            move = rng.choice(legal)
+            game.play(move)
+            moves.append(str(move))
+        games.append(moves)
+    return games
+
+
+async def _request_batch(reader, writer, requests):
+    """Sends requests (dicts) in one write and returns their responses, read back in order"""
+    writer.write(''.join(json.dumps(request) + '\n' for request in requests).encode())
+    await writer.drain()
+    return [json.loads(await reader.readline()) for _ in requests]
+
+
+async def _run_connection(open_connection, games, scripts, deadline, stats):
+    """Plays games games at once on one connection until deadline, each replaying one of scripts from the start in a
+    new game when the last one runs out. Adds to the counts in stats."""
+    reader, writer = await open_connection()
+    players = []  # [game id, script, index of next move]
+    for response in await _request_batch(reader, writer, [{'op': 'new'}] * games):
+        players.append([response['game'], scripts[len(players) % len(scripts)], 0])
+
+    round_trips = stats['round_trips']
+    while time.perf_counter() < deadline:
+        requests = []
+        for player in players:
+            game_id, script, index = player
+            if index < len(script):
+                requests.append({'op': 'move', 'game': game_id, 'move': script[index]})
+            else:
+                requests.append({'op': 'close', 'game': game_id})
+                requests.append({'op': 'new'})
+        start = time.perf_counter()
+        responses = iter(await _request_batch(reader, writer, requests))
+        round_trips.append(time.perf_counter() - start)
+        for player in players:
+            response = next(responses)
+            if player[2] < len(player[1]):
+                if response['ok']:
+                    stats['moves'] += 1
+                else:
+                    stats['rejected'] += 1
+                player[2] += 1
+            else:
+                player[0] = next(responses)['game']
+                player[2] = 0
+                stats['games'] += 1
+    writer.close()
+
+
+async def run_load(open_connection, connections=4, games=64, seconds=5.0, scripts=None):
+    """Runs connections connections, each playing games games at once, for seconds seconds against the server that
+    open_connection (a coroutine function returning (reader, writer)) connects to. Returns dict of results."""
+    scripts = scripts if scripts is not None else random_games(64)
+    stats = {'moves': 0, 'rejected': 0, 'games': 0, 'round_trips': []}
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(_run_connection(open_connection, games, scripts, deadline, stats)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    round_trips = sorted(stats['round_trips'])
+    return {'connections': connections, 'games_per_connection': games, 'seconds': round(elapsed, 3),
+            'moves': stats['moves'], 'moves_per_second': round(stats['moves'] / elapsed),
+            'rejected': stats['rejected'], 'games_finished': stats['games'],
+            'batch_round_trip_ms': {'p50': round(round_trips[len(round_trips) // 2] * 1000, 2),
+                                    'p99': round(round_trips[len(round_trips) * 99 // 100] * 1000, 2)}
+            if round_trips else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load generator for the ChessVar game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='connect to this Unix socket path instead of TCP')
+    parser.add_argument('--spawn', action='store_true', help='start a server in a subprocess on a temporary socket')
+    parser.add_argument('--engine', choices=('BitboardChessVar', 'ChessVar'), default='BitboardChessVar',
+                        help='engine of the spawned server')
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--games', type=int, default=64, help='games played at once on each connection')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    server = None
+    unix = args.unix
+    if args.spawn:
+        unix = os.path.join(tempfile.mkdtemp(), 'chessvar.sock')
+        server = subprocess.Popen([sys.executable, '-m', 'server', '--unix', unix, '--engine', args.engine],
+                                  stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(__file__)))
+        server.stdout.readline()  # wait until it is listening
+    try:
+        if unix:
+            def open_connection():
+                return asyncio.open_unix_connection(unix)
+        else:
+            def open_connection():
+                return asyncio.open_connection(args.host, args.port)
+        print(json.dumps(asyncio.run(run_load(open_connection, args.connections, args.games, args.seconds))))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
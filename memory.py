@@ -0,0 +1,77 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: Memory benchmark for ChessVar. Creates a batch of games, plays the same random opening on each, and
+# reports the bytes allocated per game as measured by tracemalloc, both for new games and for games in progress, so
+# the cost of holding many live games (e.g. on a game server) can be compared between engines and against the original
+# ChessVar in reference.py.
+# Run with: python -m memory [--games N] [--plies P] [--engine ChessVar|BitboardChessVar|reference]
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+
+def _opening(plies, seed=0):
+    """Returns list of up to plies (from_square, to_square) moves of a random game, the same whichever engine is
+    measured"""
+    from ChessVar import ChessVar
+    rng = random.Random(seed)
+    game = ChessVar()
+    moves = []
+    for _ in range(plies):
+        legal = game.generate_legal_moves()
+        if not legal or game.get_game_state() != 'UNFINISHED':
+            break
+        move = rng.choice(legal)
+        game.make_move(*move)
+        moves.append(move)
+    return moves
+
+
+def bytes_per_game(engine, games, moves=()):
+    """Returns average bytes allocated per game for games instances of engine, each with moves made on it. The shared
+    lookup tables are built before measuring, so only per-game memory is counted."""
+    engine()  # build anything created lazily on first use
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = []
+    for _ in range(games):
+        game = engine()
+        for from_square, to_square in moves:
+            game.make_move(from_square, to_square)
+        held.append(game)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return round(used / games)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bytes of memory per ChessVar game')
+    parser.add_argument('--games', type=int, default=10000, help='number of games to hold at once')
+    parser.add_argument('--plies', type=int, default=20, help='moves played on each game in progress')
+    parser.add_argument('--engine', choices=('ChessVar', 'BitboardChessVar', 'reference'), default='ChessVar',
+                        help='engine to measure, or reference for the original ChessVar')
+    args = parser.parse_args(argv)
+
+    if args.engine == 'BitboardChessVar':
+        from bitboard import BitboardChessVar as engine
+    elif args.engine == 'reference':
+        from reference import ChessVar as engine
+    else:
+        from ChessVar import ChessVar as engine
+
+    moves = _opening(args.plies)
+    print(json.dumps({'engine': args.engine, 'games': args.games,
+                      'new_game_bytes': bytes_per_game(engine, args.games),
+                      'in_progress_bytes': bytes_per_game(engine, args.games, moves), 'plies': len(moves)}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: This program contains a class LegalMoveCache, a bounded cache of the legal moves of positions keyed by
+# the game's Rules and ChessVar.position_key(), for clients that keep asking what the same positions allow (a UI
+# highlighting a piece's moves, bots, the game server). A position's moves are worked out by legal_moves the first time
+# it is asked about and looked up after that, and once the cache is full the least recently used position is evicted.
+# MOVE_CACHE is one cache shared by every game in the process.
+
+import threading
+from collections import OrderedDict
+
+from ChessVar import SQUARE_INDEX
+
+
+class LegalMoveCache:
+    """Represents a cache mapping positions, keyed by the game's Rules and position key, to their legal moves,
+    holding at most max_positions positions and evicting the least recently used one to make room. Games of different
+    classes on the same board (ChessVar, BitboardChessVar) share entries, as they agree on legal moves; games on other
+    boards never do. Safe to use from several threads."""
+
+    def __init__(self, max_positions=65536):
+        """Creates an empty cache holding at most max_positions positions"""
+        self._max_positions = max_positions
+        # (Rules, position key) -> (moves, {from square: moves from that square}), oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        """Returns number of positions currently cached"""
+        return len(self._entries)
+
+    def _entry(self, game):
+        """Returns cached (moves, moves by from square) of game's current position, computing and caching them on a
+        miss"""
+        key = _key(game)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry
+            self._misses += 1
+        moves = tuple(game.legal_moves())
+        by_square = {}
+        for move in moves:
+            by_square.setdefault(move.from_sq, []).append(move)
+        entry = (moves, {square: tuple(square_moves) for square, square_moves in by_square.items()})
+        with self._lock:
+            self._entries[key] = entry
+            if len(self._entries) > self._max_positions:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return entry
+
+    def legal_moves(self, game):
+        """Returns tuple of the Moves legal_moves returns for game's current position, from the cache if the position
+        has been seen before"""
+        return self._entry(game)[0]
+
+    def piece_moves(self, game, square):
+        """Returns tuple of the legal Moves of the piece on square (a square number, or a name on game's board such as
+        'a2') in game's current position: empty if there is no piece of the player to move there, or it can't move"""
+        if isinstance(square, str):
+            square = (SQUARE_INDEX if game.RULES.is_standard() else game.RULES.tables()['SQUARE_INDEX'])[square]
+        return self._entry(game)[1].get(square, ())
+
+    def invalidate(self, game=None):
+        """Removes game's current position from the cache, or every position if game is None"""
+        with self._lock:
+            if game is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_key(game), None)
+
+    def get_stats(self):
+        """Returns dict of lookups answered from the cache (hits) and computed (misses), positions evicted to make room,
+        and positions currently cached"""
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions, 'positions': len(self),
+                'max_positions': self._max_positions}
+
+
+def _key(game):
+    """Returns the cache key of game's current position: position keys only tell positions on the same board apart"""
+    return game.RULES, game.position_key()
+
+
+MOVE_CACHE = LegalMoveCache()  # shared by every game in the process
@@ -0,0 +1,214 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: Perft (performance test) and benchmark suite for ChessVar. perft counts the positions reached after
+# exactly N moves from a position, using legal_moves, push and pop. Counting from the starting position and
+# from a set of reference positions and comparing against the expected counts below catches any change to the move
+# rules (and the game states one move from the positions where a king has reached row 8, any change to how games
+# end), while nodes per second and the microbenchmarks of make_move, king_final_check and legal_moves measure
+# speed, with make_move also timed against the original ChessVar (reference.py) on the same random games. Prints a
+# JSON report and exits with status 1 if any count differs.
+# Run with: python -m perft [--depth N] [--engine ChessVar|BitboardChessVar] [--no-bench]
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import reference
+
+# reference positions, each reached from the starting position by the given moves
+REFERENCE_POSITIONS = {
+    'start': [],
+    'captures': ['b2a3', 'f2e4', 'c2e1', 'g1c5', 'e1d3', 'g2h3', 'a2b2', 'h3c8', 'b2d2', 'f1d2', 'a1a2', 'c5a3',
+                 'a2a3'],
+    'kings_racing': ['b2c3', 'f1g3', 'a1b2', 'h2h6', 'b2b3', 'h1h2', 'b3b4', 'h2h3', 'b4c5', 'h3h4', 'c3a5', 'h4g5',
+                     'a5b4', 'g5g6', 'c5b6', 'g3f1'],
+    'white_at_end': ['b2h8', 'h2h4', 'a1b2', 'h4e4', 'b2c3', 'g2f3', 'a2a8', 'e4d4', 'c3d4', 'f3a8', 'd4c5', 'f1e3',
+                     'c5b6', 'e3d1', 'b6a7', 'a8c6', 'a7b8'],  # black king on h1 can't reach row 8: every reply loses
+    'black_can_tie': ['b2c3', 'g2f3', 'a1b2', 'h1g2', 'b2a3', 'g2h3', 'a3b4', 'h3h4', 'b4c5', 'h4g5', 'c5b6', 'g5h6',
+                      'b6c7', 'h6h7', 'c7d8'],  # white king on row 8: black's h7g8 ties, every other reply loses
+}
+
+# EXPECTED_COUNTS[name][n] is the perft count at depth n + 1 from REFERENCE_POSITIONS[name]
+EXPECTED_COUNTS = {
+    'start': [21, 441, 11366, 288614],
+    'captures': [28, 405, 11440, 186791],
+    'kings_racing': [26, 602, 15083, 421406],
+    'white_at_end': [19, 0, 0, 0],
+    'black_can_tie': [29, 0, 0, 0],
+}
+
+# EXPECTED_ENDINGS[name] counts the game states of the positions one move from REFERENCE_POSITIONS[name], for the
+# positions where the row-8 rule decides the game, as perft counts a tie and a win alike
+EXPECTED_ENDINGS = {
+    'white_at_end': {'WHITE_WON': 19},
+    'black_can_tie': {'TIE': 1, 'WHITE_WON': 28},
+}
+
+
+def perft(game, depth):
+    """Returns number of positions reached from game's current position after exactly depth moves. A finished game
+    has no moves, so it only counts when depth is 0."""
+    if depth == 0:
+        return 1
+    moves = game.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        game.push(move)
+        nodes += perft(game, depth - 1)
+        game.pop()
+    return nodes
+
+
+def endings(game):
+    """Returns dict counting the game states of the positions one move from game's current position"""
+    states = {}
+    for move in game.legal_moves():
+        game.push(move)
+        states[game.get_game_state()] = states.get(game.get_game_state(), 0) + 1
+        game.pop()
+    return states
+
+
+def load_position(engine, moves):
+    """Returns a new game of class engine with moves (strings such as 'a2a3') made from the starting position"""
+    game = engine()
+    for move in moves:
+        if game.make_move(move[:2], move[2:]) is not True:
+            raise ValueError('illegal move %s in reference position' % move)
+    return game
+
+
+def run_perft(engine, max_depth):
+    """Counts perft from every reference position up to max_depth, returning list of result dicts"""
+    results = []
+    for name, moves in REFERENCE_POSITIONS.items():
+        game = load_position(engine, moves)
+        for depth in range(1, max_depth + 1):
+            start = time.perf_counter()
+            nodes = perft(game, depth)
+            elapsed = time.perf_counter() - start
+            expected = EXPECTED_COUNTS.get(name, [])
+            results.append({'position': name, 'depth': depth, 'nodes': nodes,
+                            'expected': expected[depth - 1] if depth <= len(expected) else None,
+                            'seconds': round(elapsed, 4),
+                            'nodes_per_second': round(nodes / elapsed) if elapsed else None})
+            if depth == 1 and name in EXPECTED_ENDINGS:
+                results[-1]['endings'] = endings(game)
+                results[-1]['expected_endings'] = EXPECTED_ENDINGS[name]
+    return results
+
+
+def _time_calls(function, calls, min_seconds=0.2):
+    """Calls function(*args) for every args tuple in calls, repeating until min_seconds have passed. Returns calls made
+    per second."""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for args in calls:
+            function(*args)
+        count += len(calls)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return round(count / elapsed)
+
+
+def run_benchmarks(engine):
+    """Times make_move, king_final_check and legal_moves over the legal moves of every reference position,
+    returning dict of calls per second. make_move is timed through push so each move can be undone with pop, so its
+    figure includes one pop per move. Moves and squares are passed as Move objects and 0-63 square numbers, so the
+    figures are for the square-numbered methods (make_move_sq, king_final_check_sq), without parsing. Also replays
+    100 random games through make_move, with algebraic squares, on engine and on the original ChessVar in reference.py,
+    so the two figures compare the engine with the implementation it replaced."""
+    games = [load_position(engine, moves) for moves in REFERENCE_POSITIONS.values()]
+    move_calls = []
+    check_calls = []
+    for game in games:
+        for move in game.legal_moves():
+            move_calls.append((game, move))
+            check_calls.append((game, game._wk_sq, move.from_sq, move.to_sq))
+            check_calls.append((game, game._bk_sq, move.from_sq, move.to_sq))
+
+    def make_move(game, move):
+        game.push(move)
+        game.pop()
+
+    def king_final_check(game, king_sq, from_sq, to_sq):
+        game.king_final_check_sq(king_sq, from_sq, to_sq)
+
+    def legal_moves(game):
+        game.legal_moves()
+
+    scripts = random_games(100)
+    return {
+        'make_move_per_second': _time_calls(make_move, move_calls),
+        'king_final_check_per_second': _time_calls(king_final_check, check_calls),
+        'legal_moves_per_second': _time_calls(legal_moves, [(game,) for game in games]),
+        'replay_make_move_per_second': replay_benchmark(engine, scripts),
+        'reference_replay_make_move_per_second': replay_benchmark(reference.ChessVar, scripts),
+    }
+
+
+def random_games(games, seed=0, max_plies=200):
+    """Returns list of games random games, each a list of the (from_square, to_square) moves played"""
+    from ChessVar import ChessVar
+    rng = random.Random(seed)
+    scripts = []
+    for _ in range(games):
+        game = ChessVar()
+        moves = []
+        while game.get_game_state() == 'UNFINISHED' and len(moves) < max_plies:
+            legal = game.generate_legal_moves()
+            if not legal:
+                break
+            move = rng.choice(legal)
+            game.make_move(*move)
+            moves.append(move)
+        scripts.append(moves)
+    return scripts
+
+
+def replay_benchmark(engine, scripts, repeat=3):
+    """Returns make_move calls per second replaying scripts, lists of (from_square, to_square) moves, each on a new game
+    of class engine, counting the time to create the games. Best of repeat runs."""
+    moves = sum(len(script) for script in scripts)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for script in scripts:
+            game = engine()
+            for from_square, to_square in script:
+                game.make_move(from_square, to_square)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(moves / best)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Perft counts and benchmarks for ChessVar')
+    parser.add_argument('--depth', type=int, default=3, help='deepest perft to count from each position')
+    parser.add_argument('--engine', choices=('ChessVar', 'BitboardChessVar'), default='ChessVar')
+    parser.add_argument('--no-bench', action='store_true', help='skip the microbenchmarks')
+    args = parser.parse_args(argv)
+
+    if args.engine == 'BitboardChessVar':
+        from bitboard import BitboardChessVar as engine
+    else:
+        from ChessVar import ChessVar as engine
+
+    results = run_perft(engine, args.depth)
+    mismatches = [result for result in results if (result['expected'] is not None and
+                  result['nodes'] != result['expected']) or result.get('endings') != result.get('expected_endings')]
+    report = {'engine': args.engine, 'perft': results, 'mismatches': len(mismatches)}
+    if not args.no_bench:
+        report['benchmarks'] = run_benchmarks(engine)
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: Streaming replay and validation of ChessVar game logs. A log has one game per line, its moves separated
+# by spaces, e.g. "a2a3 h2h3 b2c3". Moves may also be written with a dash ("a2-a3"), move numbers such as "1." are
+# skipped, and a final game state (UNFINISHED, WHITE_WON, BLACK_WON or TIE) may end the line to be checked against the
+# replay. Blank lines and lines starting with '#' are ignored. Games are read and replayed one line at a time on a
+# single ChessVar that is reset between games, so memory use stays flat however large the log is.
+# Run with: python -m replay LOG_FILE [--failures-only]
+
+import argparse
+import json
+import sys
+
+from ChessVar import ChessVar, GAME_STATES
+
+FILES = 'abcdefgh'
+RANKS = '12345678'
+
+
+def parse_move(token):
+    """Returns (from_square, to_square) for a move token such as 'a2a3' or 'a2-a3', or None if token is not a move"""
+    if len(token) == 5 and token[2] == '-':
+        token = token[:2] + token[3:]
+    if len(token) != 4 or token[0] not in FILES or token[2] not in FILES or token[1] not in RANKS or \
+            token[3] not in RANKS:
+        return None
+    return token[:2], token[2:]
+
+
+def replay_game(game, tokens):
+    """Resets game and replays the move tokens of one log line on it. Returns dict with the final 'game_state', number
+    of 'moves' made, 'first_illegal' (index of the first move make_move rejects or that can't be read, or None),
+    'illegal_move' (that move's token, or None), 'expected_state' (the state written at the end of the line, or None)
+    and 'ok' (True if every move was accepted and the final state matches any expected state)."""
+    game.reset()
+    expected_state = None
+    if tokens and tokens[-1] in GAME_STATES:
+        expected_state = tokens[-1]
+        tokens = tokens[:-1]
+    moves = 0
+    for token in tokens:
+        if token[-1] == '.':  # move number
+            continue
+        move = parse_move(token)
+        if move is None or game.make_move(move[0], move[1]) is not True:
+            return {'game_state': game.get_game_state(), 'moves': moves, 'first_illegal': moves,
+                    'illegal_move': token, 'expected_state': expected_state, 'ok': False}
+        moves += 1
+    game_state = game.get_game_state()
+    return {'game_state': game_state, 'moves': moves, 'first_illegal': None, 'illegal_move': None,
+            'expected_state': expected_state, 'ok': expected_state is None or expected_state == game_state}
+
+
+def replay_lines(lines, game=None):
+    """Yields one result dict (see replay_game) per game in lines, an iterable of log lines such as an open file, each
+    with the 'line' number it came from. Lines are consumed lazily, and every game is replayed on game (a new ChessVar
+    if none given) after resetting it."""
+    if game is None:
+        game = ChessVar()
+    for line_number, line in enumerate(lines, 1):
+        tokens = line.split()
+        if not tokens or tokens[0].startswith('#'):
+            continue
+        result = replay_game(game, tokens)
+        result['line'] = line_number
+        yield result
+
+
+def replay_file(path, game=None):
+    """Yields one result dict per game in the log file at path, reading it a line at a time (see replay_lines)"""
+    with open(path) as log:
+        yield from replay_lines(log, game)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay and validate a ChessVar game log, one game per line')
+    parser.add_argument('log_file', help="game log, or '-' for standard input")
+    parser.add_argument('--failures-only', action='store_true', help='only print games that fail to validate')
+    args = parser.parse_args(argv)
+
+    games = 0
+    failures = 0
+    results = replay_lines(sys.stdin) if args.log_file == '-' else replay_file(args.log_file)
+    for result in results:
+        games += 1
+        if not result['ok']:
+            failures += 1
+        if not result['ok'] or not args.failures_only:
+            print(json.dumps(result))
+    print(json.dumps({'games': games, 'failures': failures}), file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: This program contains a class Search, an iterative-deepening alpha-beta search that runs directly on a
+# ChessVar (or BitboardChessVar) through legal_moves, push and pop, and a function best_move for one-off
+# calls. The evaluation is tuned to this variant's race to row 8: how far each king is from row 8, how many squares
+# on each king's path forward are attacked by the opponent, and the material each side has captured.
+
+import time
+
+from ChessVar import PIECE_CODES, PIECE_COLOR, PIECE_KIND, EMPTY
+from transposition import TranspositionTable
+
+WIN_SCORE = 1000000  # score of a won game, less the number of plies needed to win it
+KING_ROW_VALUE = 100  # per row a king is closer to row 8 than the other king
+PATH_ATTACK_VALUE = 25  # per square on a king's path forward that the opponent attacks
+PIECE_VALUES = {'r': 500, 'b': 300, 'h': 300, 'k': 0}
+EXACT, LOWER, UPPER = 0, 1, 2  # bound stored with a transposition table score
+
+
+def evaluate(game):
+    """Returns score of game's current position from white's point of view: positive if white is ahead"""
+    columns = game.RULES.columns
+    wk_row, wk_column = divmod(game._wk_sq, columns)  # row index 0 is row 8, so row index is distance to row 8
+    bk_row, bk_column = divmod(game._bk_sq, columns)
+    score = (bk_row - wk_row) * KING_ROW_VALUE
+
+    # squares a king could step to on its way to row 8, attacked by the opponent
+    for row, column, enemy, sign in ((wk_row, wk_column, 'b', -1), (bk_row, bk_column, 'w', 1)):
+        if row == 0:
+            continue
+        for new_column in (column - 1, column, column + 1):
+            if 0 <= new_column < columns and game._square_attacked((row - 1) * columns + new_column, enemy):
+                score += sign * PATH_ATTACK_VALUE
+
+    captured = game._captured  # number captured of each piece code
+    for code in range(1, len(PIECE_CODES)):
+        if captured[code]:
+            value = captured[code] * PIECE_VALUES[PIECE_KIND[code]]
+            score += value if PIECE_COLOR[code] == 'b' else -value
+    return score
+
+
+class Search:
+    """Represents a search for the best move in a ChessVar game. The game is searched in place with push and pop, so
+    it is left unchanged once best_move returns."""
+
+    def __init__(self, game, table=None, tablebase=None):
+        """Creates a search over game, storing results in table (a TranspositionTable), or in a new 16 MB table if none
+        is given. Passing the same table to later searches lets them reuse earlier results. If tablebase (a
+        tablebase.Tablebase) is given, positions it covers are scored from it rather than searched."""
+        self._game = game
+        self._table = table if table is not None else TranspositionTable()
+        self._tablebase = tablebase
+        self._nodes = 0
+        self._depth = 0
+        self._score = 0
+        self._deadline = None
+        self._max_nodes = None
+        self._stopped = False
+        self._root_turn = game.get_player_turn()
+        self._path = set()  # position keys on the line currently being searched, to spot repetitions
+
+    def get_stats(self):
+        """Returns dict of nodes searched, depth completed and score found (for the side to move) by last search"""
+        return {'nodes': self._nodes, 'depth': self._depth, 'score': self._score}
+
+    def best_move(self, time_ms=1000, max_nodes=None, max_depth=64):
+        """Returns best (from_square, to_square) move found for player whose turn it is, searching one ply deeper at a
+        time until time_ms milliseconds have passed, max_nodes positions have been searched, or max_depth is reached.
+        Returns None if the game is over or the player has no legal move."""
+        game = self._game
+        moves = game.legal_moves()
+        if not moves:
+            return None
+        self._nodes = 0
+        self._depth = 0
+        self._score = 0
+        self._stopped = False
+        self._deadline = time.perf_counter() + time_ms / 1000 if time_ms is not None else None
+        self._max_nodes = max_nodes
+        self._root_turn = game.get_player_turn()
+        self._table.new_search()
+
+        best = self._order(moves, None)[0]
+        for depth in range(1, max_depth + 1):
+            score, move = self._search_root(depth)
+            if self._stopped:
+                break
+            best = move
+            self._depth = depth
+            self._score = score
+            if abs(score) >= WIN_SCORE - max_depth:  # forced result found, deeper search can't change it
+                break
+        return best.from_square, best.to_square
+
+    def _out_of_budget(self):
+        """Returns True if the search has used up its time or node budget"""
+        if self._max_nodes is not None and self._nodes >= self._max_nodes:
+            return True
+        return self._deadline is not None and time.perf_counter() >= self._deadline
+
+    def _search_root(self, depth):
+        """Searches every root move to depth, returning (score, move) of the best one"""
+        game = self._game
+        key = game.position_key()
+        entry = self._table.probe(key)
+        moves = self._order(game.legal_moves(), entry[2] if entry is not None else None)
+        alpha = -WIN_SCORE - 1
+        best_move = moves[0]
+        self._path.add(key)
+        for move in moves:
+            game.push(move)
+            score = -self._negamax(depth - 1, -WIN_SCORE - 1, -alpha, 1)
+            game.pop()
+            if self._stopped:
+                break
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._path.discard(key)
+        if not self._stopped:
+            self._table.store(key, depth, (alpha, EXACT), best_move)
+        return alpha, best_move
+
+    def _negamax(self, depth, alpha, beta, ply):
+        """Returns score of the current position for the side to move, searched depth plies deeper. A position where
+        the white king has just reached row 8 is always searched one more ply, since black's reply decides the game."""
+        game = self._game
+        self._nodes += 1
+        if self._nodes & 1023 == 0 and self._out_of_budget():
+            self._stopped = True
+        if self._stopped:
+            return 0
+
+        state = game.get_game_state()
+        if state != 'UNFINISHED':
+            return self._terminal_score(state, ply)
+        if self._tablebase is not None:
+            value = self._tablebase.probe(game)  # plies to the end of the game, negative if the side to move loses
+            if value is not None:
+                if value == 0:
+                    return 0
+                return WIN_SCORE - (ply + value) if value > 0 else -(WIN_SCORE - (ply - value))
+        if depth <= 0 and game._wk_at_end is False:
+            score = evaluate(game)
+            return score if game.get_player_turn() == 'white' else -score
+
+        key = game.position_key()
+        if key in self._path:  # repeated position on this line: no progress made, score as even
+            return 0
+        tt_move = None
+        entry = self._table.probe(key)
+        if entry is not None:
+            entry_depth, (score, bound), tt_move = entry
+            if entry_depth >= depth:
+                score = self._from_table(score, ply)
+                if bound == EXACT:
+                    return score
+                if bound == LOWER and score >= beta:
+                    return score
+                if bound == UPPER and score <= alpha:
+                    return score
+
+        moves = game.legal_moves()
+        if not moves:  # no legal move: game can't go on, score as even
+            return 0
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        self._path.add(key)
+        for move in self._order(moves, tt_move):
+            game.push(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            game.pop()
+            if self._stopped:
+                self._path.discard(key)
+                return 0
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        self._path.discard(key)
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self._table.store(key, depth, (self._to_table(best_score, ply), bound), best_move)
+        return best_score
+
+    def _terminal_score(self, state, ply):
+        """Returns score of a finished game for the side to move at ply, preferring quicker wins and slower losses.
+        The side to move is worked out from ply, since the player turn does not change on a game-ending move."""
+        if state == 'TIE':
+            return 0
+        if ply % 2 == 0:
+            side = self._root_turn
+        else:
+            side = 'black' if self._root_turn == 'white' else 'white'
+        if (state == 'WHITE_WON') == (side == 'white'):
+            return WIN_SCORE - ply
+        return -(WIN_SCORE - ply)
+
+    def _order(self, moves, tt_move):
+        """Returns moves (Move objects) sorted so the likeliest best come first: the transposition table's move, then
+        captures (most valuable victim first), then king moves toward the top row, then the rest"""
+        board = self._game._board
+        columns = self._game.RULES.columns
+
+        def priority(move):
+            if move is tt_move:
+                return -10000
+            victim = board[move.to_sq]
+            if victim != EMPTY:
+                return -1000 - PIECE_VALUES[PIECE_KIND[victim]]
+            if PIECE_KIND[board[move.from_sq]] == 'k':
+                return move.to_sq // columns - move.from_sq // columns  # -1 for a king step toward the top row
+            return 1
+        return sorted(moves, key=priority)
+
+    @staticmethod
+    def _to_table(score, ply):
+        """Returns score to store in the table: win scores are stored relative to the stored position, not the root"""
+        if score >= WIN_SCORE - 1000:
+            return score + ply
+        if score <= -(WIN_SCORE - 1000):
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_table(score, ply):
+        """Returns score read from the table, adjusted back to be relative to the root"""
+        if score >= WIN_SCORE - 1000:
+            return score - ply
+        if score <= -(WIN_SCORE - 1000):
+            return score + ply
+        return score
+
+
+def best_move(game, time_ms=1000, max_nodes=None):
+    """Returns best (from_square, to_square) move for player whose turn it is in game, searching for up to time_ms
+    milliseconds, or None if there is no legal move"""
+    return Search(game).best_move(time_ms=time_ms, max_nodes=max_nodes)
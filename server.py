@@ -0,0 +1,249 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: This program contains a class GameServer, an asyncio service hosting many ChessVar games at once over
+# a newline-delimited JSON protocol, on a TCP port or a Unix socket. Each request is one JSON object on its own line,
+# with an "op" and an optional "id" that is echoed back in its response:
+#   {"op": "new"}                                  -> {"ok": true, "game": 1}
+#   {"op": "move", "game": 1, "move": "a2a3"}      -> {"ok": true, "game": 1, "state": "UNFINISHED", "turn": "black"}
+#   {"op": "state", "game": 1}                     -> {"ok": true, "game": 1, "fen": "...", "state": ..., "turn": ...}
+#   {"op": "legal_moves", "game": 1}               -> {"ok": true, "game": 1, "moves": ["a2a3", ...]}
+#   {"op": "legal_moves", "game": 1, "square": "a2"} -> the same, for the piece on that square only
+#   {"op": "subscribe" / "unsubscribe", "game": 1} -> {"ok": true, "game": 1}
+#   {"op": "close", "game": 1}                     -> {"ok": true, "game": 1}
+# A rejected request gets {"ok": false, "error": "..."}. Responses on a connection come back in request order, so a
+# client may pipeline many requests without waiting. Moves to a game are applied one at a time under that game's lock,
+# and subscribers get one {"event": "state", ...} line per changed game every broadcast interval, however many moves
+# were made in it, rather than one per move. Legal moves come from the process-wide cache in movecache.py, so
+# positions many clients ask about are only worked out once.
+# Games are BitboardChessVar by default, the faster engine.
+# Run with: python -m server [--port P | --unix PATH] [--engine BitboardChessVar|ChessVar] [--broadcast-ms MS]
+
+import argparse
+import asyncio
+import json
+import sys
+
+from ChessVar import ChessVar, SQUARE_INDEX
+from bitboard import BitboardChessVar
+from movecache import MOVE_CACHE
+
+MAX_LINE_BYTES = 64 * 1024  # longest request line accepted before the connection is closed
+MAX_SUBSCRIBER_BUFFER = 1024 * 1024  # subscribers with more unsent bytes than this are dropped as too slow
+
+
+class HostedGame:
+    """Represents one game hosted by a GameServer: the game, the lock moves to it are made under, the connections
+    subscribed to its state, and the number of moves made in it"""
+
+    __slots__ = ('game_id', 'game', 'lock', 'subscribers', 'ply')
+
+    def __init__(self, game_id, game):
+        """Creates hosted game number game_id around game, with no subscribers"""
+        self.game_id = game_id
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.subscribers = set()  # StreamWriters of subscribed connections
+        self.ply = 0
+
+    def state(self):
+        """Returns dict describing the game's current position, as sent in state responses and broadcasts"""
+        game = self.game
+        return {'game': self.game_id, 'fen': game.to_fen(), 'state': game.get_game_state(),
+                'turn': game.get_player_turn(), 'ply': self.ply}
+
+
+class GameServer:
+    """Represents a service hosting many games, each a BitboardChessVar (or an instance of another engine class with
+    the same methods, such as ChessVar), served to clients over newline-delimited JSON. All games live in one event
+    loop thread."""
+
+    def __init__(self, engine=BitboardChessVar, broadcast_interval=0.01):
+        """Creates a server with no games, creating new games with engine and sending subscribers the state of changed
+        games every broadcast_interval seconds"""
+        self._engine = engine
+        self._broadcast_interval = broadcast_interval
+        self._games = {}
+        self._subscriptions = {}  # StreamWriter of each connection with subscriptions -> set of HostedGames
+        self._next_id = 1
+        self._changed = set()  # HostedGames with moves made since the last broadcast
+        self._broadcast_handle = None
+        self._moves = 0
+
+    def get_stats(self):
+        """Returns dict of games currently hosted and moves made since the server started"""
+        return {'games': len(self._games), 'moves': self._moves}
+
+    async def serve_tcp(self, host='127.0.0.1', port=8765):
+        """Starts listening on host and port, returning the asyncio Server"""
+        return await asyncio.start_server(self._handle_connection, host, port, limit=MAX_LINE_BYTES)
+
+    async def serve_unix(self, path):
+        """Starts listening on the Unix socket at path, returning the asyncio Server"""
+        return await asyncio.start_unix_server(self._handle_connection, path, limit=MAX_LINE_BYTES)
+
+    async def _handle_connection(self, reader, writer):
+        """Reads requests from one connection until it closes, answering them in order. Requests already buffered are
+        handled together and their responses written in a single write."""
+        pending = b''
+        try:
+            while True:
+                data = await reader.read(MAX_LINE_BYTES)
+                if not data:
+                    break
+                lines = (pending + data).split(b'\n')
+                pending = lines.pop()
+                if len(pending) > MAX_LINE_BYTES:
+                    writer.write(b'{"ok": false, "error": "request line too long"}\n')
+                    break
+                responses = []
+                for line in lines:
+                    if line.strip():
+                        responses.append(await self.handle_request(line, writer))
+                if responses:
+                    writer.write(('\n'.join(responses) + '\n').encode())
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for hosted in self._subscriptions.pop(writer, ()):
+                hosted.subscribers.discard(writer)
+            writer.close()
+
+    async def handle_request(self, line, writer=None):
+        """Returns JSON response (without newline) to request line, a JSON object as bytes or str. writer is the
+        connection the request came from, needed to subscribe it to a game."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError
+        except ValueError:
+            return json.dumps({'ok': False, 'error': 'invalid JSON object'})
+        response = await self._dispatch(request, writer)
+        if 'id' in request:
+            response['id'] = request['id']
+        return json.dumps(response)
+
+    async def _dispatch(self, request, writer):
+        """Carries out request (a dict), returning response dict"""
+        op = request.get('op')
+        if op == 'new':
+            game_id = self._next_id
+            self._next_id += 1
+            self._games[game_id] = HostedGame(game_id, self._engine())
+            return {'ok': True, 'game': game_id}
+
+        game_id = request.get('game')
+        hosted = self._games.get(game_id) if isinstance(game_id, int) else None
+        if hosted is None:
+            return {'ok': False, 'error': 'unknown game'}
+        if op == 'move':
+            return await self._move(hosted, request.get('move'))
+        if op == 'state':
+            response = hosted.state()
+            response['ok'] = True
+            return response
+        if op == 'legal_moves':
+            square = request.get('square')
+            if square is None:
+                moves = MOVE_CACHE.legal_moves(hosted.game)
+            elif isinstance(square, str) and square in SQUARE_INDEX:
+                moves = MOVE_CACHE.piece_moves(hosted.game, square)
+            else:
+                return {'ok': False, 'error': 'invalid square'}
+            return {'ok': True, 'game': hosted.game_id, 'moves': [str(move) for move in moves]}
+        if op == 'subscribe' and writer is not None:
+            hosted.subscribers.add(writer)
+            self._subscriptions.setdefault(writer, set()).add(hosted)
+            return {'ok': True, 'game': hosted.game_id}
+        if op == 'unsubscribe':
+            self._unsubscribe(hosted, writer)
+            return {'ok': True, 'game': hosted.game_id}
+        if op == 'close':
+            del self._games[hosted.game_id]
+            self._changed.discard(hosted)
+            for subscriber in list(hosted.subscribers):
+                self._unsubscribe(hosted, subscriber)
+            return {'ok': True, 'game': hosted.game_id}
+        return {'ok': False, 'error': 'unknown op'}
+
+    def _unsubscribe(self, hosted, writer):
+        """Stops sending the connection of writer the state of hosted game"""
+        hosted.subscribers.discard(writer)
+        subscriptions = self._subscriptions.get(writer)
+        if subscriptions is not None:
+            subscriptions.discard(hosted)
+            if not subscriptions:
+                del self._subscriptions[writer]
+
+    async def _move(self, hosted, move):
+        """Makes move (a string such as 'a2a3') in hosted game under its lock, returning response dict"""
+        if not isinstance(move, str) or len(move) != 4 or move[:2] not in SQUARE_INDEX or \
+                move[2:] not in SQUARE_INDEX:
+            return {'ok': False, 'error': 'invalid move'}
+        async with hosted.lock:
+            game = hosted.game
+            if game.make_move(move[:2], move[2:]) is not True:
+                return {'ok': False, 'error': 'illegal move', 'game': hosted.game_id}
+            hosted.ply += 1
+            self._moves += 1
+            if hosted.subscribers:
+                self._changed.add(hosted)
+                if self._broadcast_handle is None:
+                    self._broadcast_handle = asyncio.get_running_loop().call_later(self._broadcast_interval,
+                                                                                  self._broadcast)
+            return {'ok': True, 'game': hosted.game_id, 'state': game.get_game_state(),
+                    'turn': game.get_player_turn()}
+
+    def _broadcast(self):
+        """Sends every subscriber of each game changed since the last broadcast one line with the game's state. A
+        subscriber that has fallen too far behind reading them is disconnected."""
+        self._broadcast_handle = None
+        changed = self._changed
+        self._changed = set()
+        for hosted in changed:
+            event = hosted.state()
+            event['event'] = 'state'
+            line = (json.dumps(event) + '\n').encode()
+            for writer in list(hosted.subscribers):
+                if writer.is_closing():
+                    self._unsubscribe(hosted, writer)
+                elif writer.transport.get_write_buffer_size() > MAX_SUBSCRIBER_BUFFER:
+                    self._unsubscribe(hosted, writer)
+                    writer.close()
+                else:
+                    writer.write(line)
+
+
+async def _serve(args):
+    """Runs a GameServer with the command line options in args until cancelled"""
+    engine = ChessVar if args.engine == 'ChessVar' else BitboardChessVar
+    server = GameServer(engine, args.broadcast_ms / 1000)
+    if args.unix:
+        listener = await server.serve_unix(args.unix)
+        where = args.unix
+    else:
+        listener = await server.serve_tcp(args.host, args.port)
+        where = '%s:%d' % (args.host, args.port)
+    print(json.dumps({'listening': where, 'engine': args.engine}), flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Host ChessVar games over newline-delimited JSON')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--engine', choices=('BitboardChessVar', 'ChessVar'), default='BitboardChessVar')
+    parser.add_argument('--broadcast-ms', type=float, default=10, help='milliseconds between state broadcasts')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: This program contains a function simulate, which plays a batch of ChessVar games across a pool of
+# worker processes. Each game is either a list of moves to replay or an integer seed for a self-play game of random
+# legal moves. Games are sent to the workers in chunks, each worker process imports ChessVar once and plays every game
+# on a single ChessVar reset between games, and results are yielded as soon as their chunk completes.
+# Run with: python -m simulate [--games N] [--workers W] [--chunk-size C]
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from ChessVar import SQUARE_INDEX
+
+_game = None  # game reused for every game played in a worker process, set once by _init_worker
+
+
+def _init_worker(engine_name):
+    """Runs once in each worker process: imports the game class named engine_name ('ChessVar' or 'BitboardChessVar')
+    and creates the game the worker plays on"""
+    global _game
+    if engine_name == 'BitboardChessVar':
+        from bitboard import BitboardChessVar
+        _game = BitboardChessVar()
+    else:
+        from ChessVar import ChessVar
+        _game = ChessVar()
+
+
+def _parse(move):
+    """Returns (from_square, to_square) for move, a tuple of two squares or a string such as 'a1a2', or None if it does
+    not name two squares of the board"""
+    if isinstance(move, str):
+        move = (move[:2], move[2:])
+    if len(move) != 2 or move[0] not in SQUARE_INDEX or move[1] not in SQUARE_INDEX:
+        return None
+    return move
+
+
+def play(game, job, max_plies=300):
+    """Plays one game on game (a ChessVar in the starting position) and returns (game state, number of moves made,
+    index of first illegal move or None). job is either a list of moves, each a (from_square, to_square) tuple or a
+    string such as 'a1a2', which are replayed until one is rejected or can't be read (such as 'zz99'), or an integer
+    seed for a self-play game of random legal moves, which is played until the game ends, the side to move has no legal
+    move, or max_plies moves have been made."""
+    if isinstance(job, int):
+        rng = random.Random(job)
+        moves_made = 0
+        while moves_made < max_plies and game.get_game_state() == 'UNFINISHED':
+            moves = game.legal_moves()
+            if not moves:
+                break
+            game.play(rng.choice(moves))
+            moves_made += 1
+        return game.get_game_state(), moves_made, None
+
+    for index, move in enumerate(job):
+        move = _parse(move)
+        if move is None or game.make_move(move[0], move[1]) is not True:
+            return game.get_game_state(), index, index
+    return game.get_game_state(), len(job), None
+
+
+def _play_chunk(chunk, max_plies):
+    """Runs in a worker process: plays every (index, job) in chunk, returning list of (index, result) pairs"""
+    results = []
+    for index, job in chunk:
+        _game.reset()
+        results.append((index, play(_game, job, max_plies)))
+    return results
+
+
+def _chunks(jobs, chunk_size):
+    """Yields lists of up to chunk_size (index, job) pairs from jobs, numbering jobs from 0"""
+    chunk = []
+    for index, job in enumerate(jobs):
+        chunk.append((index, job))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def simulate(jobs, workers=None, chunk_size=64, max_plies=300, engine='ChessVar'):
+    """Plays every game in jobs (an iterable of move lists or self-play seeds, see play) across workers processes (one
+    per CPU by default) and yields one dict per game, in the order games finish:
+    {'index': position of the job in jobs, 'game_state': final get_game_state(), 'moves': moves made,
+    'first_illegal': index of the first move rejected or that can't be read, or None}.
+    jobs is read lazily, with at most a few chunks per worker in flight, so it can be a generator over any number of
+    games. engine is 'ChessVar' or 'BitboardChessVar'."""
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(jobs, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_play_chunk, chunk, max_plies))
+            if len(pending) >= workers * 4:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for index, (game_state, moves, first_illegal) in future.result():
+                    yield {'index': index, 'game_state': game_state, 'moves': moves, 'first_illegal': first_illegal}
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(pool.submit(_play_chunk, chunk, max_plies))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play self-play ChessVar games across a process pool')
+    parser.add_argument('--games', type=int, default=1000, help='number of self-play games (seeds 0 to N-1)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='games sent to a worker at a time')
+    parser.add_argument('--max-plies', type=int, default=300, help='longest self-play game')
+    parser.add_argument('--engine', choices=('ChessVar', 'BitboardChessVar'), default='ChessVar')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    states = {}
+    moves = 0
+    for result in simulate(range(args.games), args.workers, args.chunk_size, args.max_plies, args.engine):
+        states[result['game_state']] = states.get(result['game_state'], 0) + 1
+        moves += result['moves']
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'games': args.games, 'moves': moves, 'seconds': round(elapsed, 3),
+                      'games_per_second': round(args.games / elapsed, 1), 'game_states': states}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,498 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: Endgame tablebases for ChessVar positions with few pieces. build solves every position with a given set
+# of pieces by retrograde analysis under the game's rules (neither king may be left in check, kings may not be
+# adjacent, and black's one reply once the white king reaches row 8 ties or loses the game), and writes the result of
+# each to a file: one signed byte per position, the number of plies to the end of the game with best play, positive if
+# the side to move wins and negative if it loses, 0 for a draw. A class Tablebase memory-maps those files and looks a
+# position up in constant time. Tables are named by their pieces, white's in upper case then black's, kings first:
+# 'KRk' is white king and rook against black king, 'KHkh' adds a knight each. A table with n pieces besides the kings
+# holds 2 * 64 ** (n + 2) positions, so 'KRk' takes 512 KB and 'KHkh' 32 MB; five-piece tables (2 GB) are possible
+# but slow to build, and building one needs three bytes of memory per position (6 GB) plus four per queued position.
+# verify checks a table against ChessVar itself: the value of each position must be the best of the values of the
+# positions its legal moves lead to.
+# Run with: python -m tablebase KRk KHkh [--dir DIR] | python -m tablebase --probe FEN [--dir DIR]
+#           python -m tablebase --verify KRk [--positions N] [--dir DIR]
+
+import argparse
+import itertools
+import json
+import mmap
+import os
+import random
+import sys
+import time
+from array import array
+
+from ChessVar import (ChessVar, PIECE_CODES, PIECE_COLOR, PIECE_KIND, PIECE_INDEX, FEN_LETTERS, FEN_PIECES, WK, BK,
+                      KING_ATTACKS, KNIGHT_ATTACKS, rook_attacks, bishop_attacks)
+
+MAGIC = b'CVTB'
+VERSION = 1
+HEADER_BYTES = 16  # MAGIC, VERSION, number of pieces besides the kings, their piece codes, zero padding
+INVALID = 0x80  # byte stored for a position that can't arise in a game (as a signed byte, -128)
+MAX_DISTANCE = 127  # longest distance to the end of the game a byte can hold
+WON = 0x80  # flag in a builder's count of remaining moves: a win has been queued (counts stay below 8 + 14 * 8)
+DEFAULT_DIR = 'tablebases'
+
+
+def material_codes(name):
+    """Returns tuple of piece codes of the pieces besides the kings in table name (e.g. 'KRkh' -> (WR, BH)), sorted, so
+    every name for the same pieces gives the same tuple. Raises ValueError if name is not a valid table name."""
+    if name.count('K') != 1 or name.count('k') != 1 or any(letter not in FEN_PIECES for letter in name):
+        raise ValueError('invalid tablebase name %r: expected piece letters with one K and one k, e.g. KRkh' % name)
+    return tuple(sorted(PIECE_INDEX[FEN_PIECES[letter]] for letter in name if letter not in 'Kk'))
+
+
+def material_name(codes):
+    """Returns table name of the pieces besides the kings with piece codes codes, e.g. (WR, BH) -> 'KRkh'"""
+    letters = [FEN_LETTERS[PIECE_CODES[code]] for code in sorted(codes)]
+    return 'K' + ''.join(letter for letter in letters if letter.isupper()) + 'k' + \
+        ''.join(letter for letter in letters if letter.islower())
+
+
+def _index(black, squares):
+    """Returns position number of the position with the pieces on squares (white king, black king, then the other
+    pieces in table order), black to move if black is true"""
+    index = 1 if black else 0
+    for square in squares:
+        index = index * 64 + square
+    return index
+
+
+def _squares(index, pieces):
+    """Returns (black, squares) for position number index of a table of pieces pieces including the kings, the
+    inverse of _index"""
+    squares = [0] * pieces
+    for slot in range(pieces - 1, -1, -1):
+        index, squares[slot] = divmod(index, 64)
+    return index == 1, squares
+
+
+def _piece_attacks(code, square, occupied):
+    """Returns bitmask of squares attacked by the piece with piece code code on 0-63 square, given bitmask of occupied
+    squares"""
+    kind = PIECE_KIND[code]
+    if kind == 'k':
+        return KING_ATTACKS[square]
+    if kind == 'h':
+        return KNIGHT_ATTACKS[square]
+    if kind == 'r':
+        return rook_attacks(square, occupied)
+    return bishop_attacks(square, occupied)
+
+
+def _kings_safe(codes, squares, occupied):
+    """Returns True if the kings are not adjacent and neither is attacked by an opponent's rook, bishop or knight: the
+    condition every move must leave the board in (see ChessVar.is_legal_sq)"""
+    wk_sq = squares[0]
+    bk_sq = squares[1]
+    if KING_ATTACKS[wk_sq] >> bk_sq & 1:
+        return False
+    for slot in range(2, len(squares)):
+        code = codes[slot]
+        king_sq = bk_sq if PIECE_COLOR[code] == 'w' else wk_sq
+        if _piece_attacks(code, squares[slot], occupied) >> king_sq & 1:
+            return False
+    return True
+
+
+def _child_value(value):
+    """Returns value of a position for the player who moved into it, from its stored byte value (for the player to
+    move in it), with the move into it counted: a loss in n for the opponent is a win in n + 1, and so on"""
+    if value == 0:
+        return 0
+    if value < INVALID:
+        return -(value + 1)
+    return 256 - value + 1
+
+
+class _Builder:
+    """Represents one table being solved: the values found so far, and for every unsolved position how many of its
+    moves are still unsolved, the longest loss among its solved moves, and whether a win has been found. Takes three
+    bytes per position, plus four per position waiting in a queue."""
+
+    def __init__(self, codes, subtables):
+        """Creates builder for the table of the pieces with piece codes codes besides the kings, given dict mapping the
+        material tuple of each table one capture away to its values"""
+        self._codes = (WK, BK) + codes
+        self._subtables = subtables
+        self._pieces = len(self._codes)
+        self._size = 2 * 64 ** self._pieces
+        self._values = bytearray(self._size)  # 0 until solved (or for draws), INVALID for impossible positions
+        self._remaining = bytearray(self._size)  # moves not yet known to lose, including drawn captures, | WON
+        self._longest_loss = bytearray(self._size)
+        self._typecode = 'I' if self._size <= 1 << 32 else 'Q'  # queued position numbers fit 4 bytes up to 5 pieces
+        self._wins = {}  # distance -> array of positions queued as won in that many plies
+        self._losses = {}
+
+    def _queue(self, queues, distance, index):
+        """Adds position index to the queue for distance in queues"""
+        if distance > MAX_DISTANCE:
+            raise ValueError('distance to the end of the game too long to store: %d plies' % distance)
+        if distance not in queues:
+            queues[distance] = array(self._typecode)
+        queues[distance].append(index)
+
+    def _squares(self, index):
+        """Returns (black, squares) for position number index"""
+        return _squares(index, self._pieces)
+
+    def _valid(self, black, squares, occupied):
+        """Returns True if the position can arise in an unfinished game: pieces on distinct squares, the black king not
+        on row 8, the white king on row 8 only with black to reply, and both kings safe"""
+        if bin(occupied).count('1') != self._pieces or squares[1] < 8 or (squares[0] < 8 and not black):
+            return False
+        return _kings_safe(self._codes, squares, occupied)
+
+    def _scan(self, index, black, squares, occupied):
+        """Counts the moves of the valid position index, queueing it at once if a move ends the game or captures into
+        a solved table"""
+        codes = self._codes
+        color = 'b' if black else 'w'
+        wk_at_end = black and squares[0] < 8
+        own = 0
+        for slot in range(self._pieces):
+            if PIECE_COLOR[codes[slot]] == color:
+                own |= 1 << squares[slot]
+        internal = 0
+        moves = 0
+        best_win = 0
+        longest_loss = 0
+        for slot in range(self._pieces):
+            code = codes[slot]
+            if PIECE_COLOR[code] != color:
+                continue
+            from_sq = squares[slot]
+            targets = _piece_attacks(code, from_sq, occupied) & ~own
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                to_sq = bit.bit_length() - 1
+                after = squares[:]
+                after[slot] = to_sq
+                after_codes = codes
+                captured = None
+                if occupied & bit:
+                    captured = squares.index(to_sq)
+                    if captured < 2:  # can't capture a king
+                        continue
+                    del after[captured]
+                    after_codes = codes[:captured] + codes[captured + 1:]
+                if not _kings_safe(after_codes, after, (occupied & ~(1 << from_sq)) | bit):
+                    continue
+                moves += 1
+                if wk_at_end:  # black's reply ends the game: a tie if the black king also reaches row 8
+                    if slot == 1 and to_sq < 8:
+                        internal += 1  # counted as a move that never resolves, so the position is at best a draw
+                    elif longest_loss < 1:
+                        longest_loss = 1
+                    continue
+                if black and slot == 1 and to_sq < 8:
+                    best_win = 1
+                    continue
+                if captured is None:
+                    internal += 1
+                    continue
+                value = _child_value(self._subtables[after_codes[2:]][_index(not black, after)])
+                if value > 0:
+                    if best_win == 0 or value < best_win:
+                        best_win = value
+                elif value < 0:
+                    if -value > longest_loss:
+                        longest_loss = -value
+                else:
+                    internal += 1  # drawn capture: never resolves
+        self._remaining[index] = internal | WON if best_win else internal
+        self._longest_loss[index] = longest_loss
+        if best_win:
+            self._queue(self._wins, best_win, index)
+        elif moves and internal == 0:
+            self._queue(self._losses, longest_loss, index)
+
+    def _predecessors(self, black, squares):
+        """Yields position numbers of the valid, unfinished positions from which a move without a capture leads to
+        the position with the pieces on squares, black to move if black is true"""
+        codes = self._codes
+        mover = 'w' if black else 'b'
+        occupied = 0
+        for square in squares:
+            occupied |= 1 << square
+        for slot in range(self._pieces):
+            code = codes[slot]
+            if PIECE_COLOR[code] != mover:
+                continue
+            to_sq = squares[slot]
+            origins = _piece_attacks(code, to_sq, occupied) & ~occupied  # every piece moves the same way back
+            while origins:
+                bit = origins & -origins
+                origins ^= bit
+                before = squares[:]
+                before[slot] = bit.bit_length() - 1
+                if mover == 'b' and before[0] < 8:  # white king on row 8: black's move would have ended the game
+                    continue
+                index = _index(not black, before)
+                if self._values[index] != INVALID:
+                    yield index
+
+    def build(self):
+        """Returns bytearray of the value of every position in the table"""
+        values = self._values
+        index = 0
+        for black in (False, True):
+            for squares in itertools.product(range(64), repeat=self._pieces):
+                squares = list(squares)
+                occupied = 0
+                for square in squares:
+                    occupied |= 1 << square
+                if self._valid(black, squares, occupied):
+                    self._scan(index, black, squares, occupied)
+                else:
+                    values[index] = INVALID
+                index += 1
+
+        distance = 1
+        while distance <= max(max(self._wins, default=0), max(self._losses, default=0)):
+            for index in self._losses.pop(distance, ()):
+                if values[index] == 0:
+                    values[index] = 256 - distance
+                    black, squares = self._squares(index)
+                    for before in self._predecessors(black, squares):
+                        if values[before] == 0:  # queued again even if a slower win is, as the first one solves it
+                            self._remaining[before] |= WON
+                            self._queue(self._wins, distance + 1, before)
+            for index in self._wins.pop(distance, ()):
+                if values[index] == 0:
+                    values[index] = distance
+                    black, squares = self._squares(index)
+                    for before in self._predecessors(black, squares):
+                        if values[before] == 0:
+                            if self._longest_loss[before] < distance + 1:
+                                self._longest_loss[before] = distance + 1
+                            self._remaining[before] -= 1  # never below 0, so WON is left alone
+                            if self._remaining[before] == 0:  # and no win queued
+                                self._queue(self._losses, self._longest_loss[before], before)
+            distance += 1
+        return values
+
+
+def _table_path(directory, codes):
+    """Returns path of the table file for the pieces with piece codes codes besides the kings"""
+    return os.path.join(directory, material_name(codes) + '.cvtb')
+
+
+def _read_values(path, codes):
+    """Returns bytes of position values stored in table file path, checking its header matches codes"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:HEADER_BYTES] != _header(codes):
+        raise ValueError('%s is not a tablebase for %s' % (path, material_name(codes)))
+    return data[HEADER_BYTES:]
+
+
+def _header(codes):
+    """Returns header bytes of the table file for the pieces with piece codes codes besides the kings"""
+    return (MAGIC + bytes((VERSION, len(codes))) + bytes(codes)).ljust(HEADER_BYTES, b'\0')
+
+
+def build(name, directory=DEFAULT_DIR):
+    """Builds the table named name (e.g. 'KRkh') in directory, first building any table one capture away that is not
+    there yet, since captures lead into them. Returns path of the table file."""
+    codes = material_codes(name)
+    os.makedirs(directory, exist_ok=True)
+    subtables = {}
+    for slot in range(len(codes)):
+        subcodes = codes[:slot] + codes[slot + 1:]
+        if subcodes not in subtables:
+            path = _table_path(directory, subcodes)
+            if not os.path.exists(path):
+                build(material_name(subcodes), directory)
+            subtables[subcodes] = _read_values(path, subcodes)
+    values = _Builder(codes, subtables).build()
+    path = _table_path(directory, codes)
+    with open(path + '.tmp', 'wb') as file:
+        file.write(_header(codes))
+        file.write(values)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+class Tablebase:
+    """Represents the tables in one directory, memory-mapped as they are first needed, for looking up positions"""
+
+    def __init__(self, directory=DEFAULT_DIR, max_pieces=5):
+        """Creates tablebase reading the table files in directory, looking up positions of at most max_pieces pieces
+        including the kings"""
+        self._directory = directory
+        self._max_pieces = max_pieces
+        self._tables = {}  # material tuple -> mmap, or None if there is no table file for it
+
+    def _table(self, codes):
+        """Returns mmap of the table for the pieces with piece codes codes besides the kings, or None if there is no
+        table file for them"""
+        if codes not in self._tables:
+            path = _table_path(self._directory, codes)
+            table = None
+            if os.path.exists(path):
+                with open(path, 'rb') as file:
+                    table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if table[:HEADER_BYTES] != _header(codes):
+                    table.close()
+                    raise ValueError('%s is not a tablebase for %s' % (path, material_name(codes)))
+            self._tables[codes] = table
+        return self._tables[codes]
+
+    def probe(self, game):
+        """Returns value of the current position of game for the player to move: the number of plies to the end of the
+        game with best play, positive if the player to move wins and negative if they lose, or 0 for a draw. Returns
+        None if the game is over, is not on the standard 8x8 board, or there is no table for its pieces."""
+        if (game.RULES.rows, game.RULES.columns) != (8, 8):
+            return None
+        if game._game_state != 'UNFINISHED' or game._wk_at_end != (game._wk_sq < 8):
+            return None
+        occupied = game._occupied
+        if bin(occupied).count('1') > self._max_pieces:
+            return None
+        board = game._board
+        pieces = []
+        while occupied:
+            bit = occupied & -occupied
+            occupied ^= bit
+            square = bit.bit_length() - 1
+            code = board[square]
+            if code != WK and code != BK:
+                pieces.append((code, square))
+        pieces.sort()
+        table = self._table(tuple(code for code, _ in pieces))
+        if table is None:
+            return None
+        index = _index(game._player_turn == 'black', [game._wk_sq, game._bk_sq] + [square for _, square in pieces])
+        value = table[HEADER_BYTES + index]
+        if value == INVALID:
+            return None
+        return value if value < INVALID else value - 256
+
+    def move_values(self, game):
+        """Returns list of (Move, value) for every legal move of the player to move in game, value being the value of
+        the move for that player (see probe), counting the move itself: 1 for a move that wins the game, 0 for one that
+        ties, -1 for one that loses it. value is None for a move into a position no table covers."""
+        values = []
+        for move in game.legal_moves():
+            game.push(move)
+            state = game.get_game_state()
+            if state == 'UNFINISHED':
+                value = self.probe(game)
+                value = None if value is None else _child_value(value & 0xFF)
+            elif state == 'TIE':
+                value = 0
+            elif (state == 'WHITE_WON') == (game.get_player_turn() == 'white'):  # turn doesn't change on the last move
+                value = 1
+            else:
+                value = -1
+            game.pop()
+            values.append((move, value))
+        return values
+
+    def best_move(self, game):
+        """Returns the Move with the best value for the player to move in game: the quickest win, else a draw, else the
+        slowest loss. Returns None if the game is over, the player has no legal move, or a move leads to a position
+        no table covers."""
+        best = None
+        best_value = None
+        for move, value in self.move_values(game):
+            if value is None:
+                return None
+            if best_value is None or _rank(value) > _rank(best_value):
+                best = move
+                best_value = value
+        return best
+
+    def close(self):
+        """Unmaps every table file opened so far"""
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables = {}
+
+
+def _rank(value):
+    """Returns sort key of value (see Tablebase.probe) for the player it belongs to, larger being better: quicker wins
+    first, then draws, then slower losses"""
+    if value > 0:
+        return 2, -value
+    if value == 0:
+        return 1, 0
+    return 0, -value
+
+
+def verify(name, directory=DEFAULT_DIR, positions=10000, seed=0):
+    """Checks the table named name in directory against ChessVar: for each of positions positions picked at random
+    (every position of the table if positions is 0), the stored value must be the best value over the positions the
+    legal moves of ChessVar lead to, or a draw if there is no legal move. Returns dict counting the positions checked by
+    value ('wins', 'losses', 'draws') and listing the to_fen strings of those that fail ('mismatches'). Raises
+    ValueError if there is no table file for name."""
+    codes = material_codes(name)
+    path = _table_path(directory, codes)
+    if not os.path.exists(path):
+        raise ValueError('no table file %s' % path)
+    pieces = (WK, BK) + codes
+    size = 2 * 64 ** len(pieces)
+    tablebase = Tablebase(directory, max_pieces=len(pieces))
+    table = tablebase._table(codes)
+    rng = random.Random(seed)
+    indexes = range(size) if positions == 0 else (rng.randrange(size) for _ in range(positions * 20))
+    report = {'table': name, 'wins': 0, 'losses': 0, 'draws': 0, 'mismatches': []}
+    checked = 0
+    for index in indexes:
+        if positions and checked == positions:
+            break
+        if table[HEADER_BYTES + index] == INVALID:
+            continue
+        checked += 1
+        black, squares = _squares(index, len(pieces))
+        board = bytearray(64)
+        for code, square in zip(pieces, squares):
+            board[square] = code
+        game = ChessVar.__new__(ChessVar)
+        game._load_position(board, 'black' if black else 'white', squares[0] < 8, False, 'UNFINISHED')
+        value = tablebase.probe(game)
+        move_values = [move_value for _, move_value in tablebase.move_values(game)]
+        expected = None if None in move_values else max(move_values, key=_rank, default=0)
+        report['wins' if value > 0 else 'losses' if value < 0 else 'draws'] += 1
+        if value != expected:
+            report['mismatches'].append(game.to_fen())
+    tablebase.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or probe ChessVar endgame tablebases')
+    parser.add_argument('tables', nargs='*', help="tables to build, e.g. KRk KHkh")
+    parser.add_argument('--dir', default=DEFAULT_DIR, help='directory of the table files')
+    parser.add_argument('--probe', default=None, help='position (a to_fen string) to look up')
+    parser.add_argument('--verify', action='append', default=[], metavar='TABLE',
+                        help='table to check against ChessVar (may be repeated)')
+    parser.add_argument('--positions', type=int, default=10000,
+                        help='random positions to check per table with --verify, or 0 for all')
+    args = parser.parse_args(argv)
+
+    for name in args.tables:
+        start = time.perf_counter()
+        path = build(name, args.dir)
+        print(json.dumps({'table': name, 'path': path, 'seconds': round(time.perf_counter() - start, 1)}))
+    if args.probe:
+        game = ChessVar.from_fen(args.probe)
+        tablebase = Tablebase(args.dir)
+        move = tablebase.best_move(game)
+        print(json.dumps({'value': tablebase.probe(game), 'best_move': str(move) if move else None}))
+    failed = False
+    for name in args.verify:
+        report = verify(name, args.dir, args.positions)
+        failed = failed or bool(report['mismatches'])
+        print(json.dumps(report))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# Author: Brenda Rodriguez
+# GitHub username: rodrigb4
+# Date: 10/18/2026
+# Description: This program contains a class TranspositionTable, a fixed-size table of results keyed by
+# ChessVar.position_key(), so a search or legality cache can reuse work when the same position is reached again by a
+# different move order. Its size is set by a memory budget, and when two positions land on the same slot a
+# replacement policy decides which one is kept.
+
+
+class TranspositionTable:
+    """Represents a bounded table mapping position keys to stored results. Each key hashes to a bucket of two slots:
+    the first keeps the entry searched to the greatest depth (so expensive results survive), the second always takes
+    the newest entry (so recent positions are found too). An entry stored in an earlier generation (see new_search)
+    may be replaced in the first slot regardless of depth."""
+
+    ENTRY_BYTES = 160  # approximate memory per stored entry: its tuple, key, and list slot
+
+    def __init__(self, memory_bytes=16 * 1024 * 1024):
+        """Creates an empty table using roughly memory_bytes of memory (16 MB by default). The number of buckets is
+        rounded down to a power of two so a key's bucket is found by masking its low bits."""
+        buckets = 1
+        while buckets * 4 * self.ENTRY_BYTES <= memory_bytes:
+            buckets *= 2
+        self._mask = buckets - 1
+        self._slots = [None] * (buckets * 2)  # entries are (key, depth, value, move, generation) tuples
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        """Returns number of entries currently stored"""
+        return len(self._slots) - self._slots.count(None)
+
+    def capacity(self):
+        """Returns maximum number of entries the table can hold"""
+        return len(self._slots)
+
+    def new_search(self):
+        """Starts a new generation, so entries stored before now give up their slot to any new entry"""
+        self._generation += 1
+
+    def clear(self):
+        """Removes every entry"""
+        self._slots = [None] * len(self._slots)
+        self._hits = 0
+        self._misses = 0
+
+    def store(self, key, depth, value, move=None):
+        """Stores value (and optionally the best move found) for position key, searched to the given depth"""
+        index = (key & self._mask) * 2
+        entry = (key, depth, value, move, self._generation)
+        deepest = self._slots[index]
+        if deepest is None or deepest[0] == key or depth >= deepest[1] or deepest[4] != self._generation:
+            self._slots[index] = entry
+        else:
+            self._slots[index + 1] = entry
+
+    def probe(self, key):
+        """Returns (depth, value, move) stored for position key, or None if the table has no entry for it"""
+        index = (key & self._mask) * 2
+        for entry in (self._slots[index], self._slots[index + 1]):
+            if entry is not None and entry[0] == key:
+                self._hits += 1
+                return entry[1], entry[2], entry[3]
+        self._misses += 1
+        return None
+
+    def get_stats(self):
+        """Returns dict of probe hits and misses, and the number of entries stored"""
+        return {'hits': self._hits, 'misses': self._misses, 'entries': len(self), 'capacity': self.capacity()}